@@ -0,0 +1,505 @@
+"""
+A local stand-in for the Telegram Bot API for load and soak testing.
+
+It serves `getUpdates`, `sendMessage`, `sendPhoto`, `editMessageText`, `answerCallbackQuery` and a few service methods,
+generates scripted traffic of fake users and rejects requests above Telegram-like limits with 429 and `retry_after`.
+Fake users send commands and text, and press buttons of inline keyboards they received, so dialogs are exercised too.
+
+Point the bot at it with `BOT_API_URL`:
+
+    python benchmarks/fake_telegram.py --port 8081 --users 1000 --updates-per-second 50
+    BOT_API_URL=http://localhost:8081 python -m birthday_reminder
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+logger = logging.getLogger("fake_telegram")
+
+BOT_USER = {
+    "id": 1,
+    "is_bot": True,
+    "first_name": "Birthday Reminder",
+    "username": "birthday_reminder_fake_bot",
+    "can_join_groups": False,
+    "can_read_all_group_messages": False,
+    "supports_inline_queries": False,
+}
+COMMANDS = [
+    "/start",
+    "/help",
+    "/language",
+    "/stats",
+    "/timezone Europe/Moscow",
+    "/timezone America/New_York",
+    "/hour 9",
+    "/hour 21",
+]
+TEXTS = ["Alice", "Bob", "Mom", "01.02", "29.02", "31.12", "hello"]
+# The first user has this id, so fake chats don't collide with real ones
+FIRST_USER_ID = 10_000_000
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+
+    def take(self) -> float:
+        """
+        Take a token.
+
+        :return: 0 if the token is taken, otherwise seconds until a token is available.
+        """
+
+        now = time.monotonic()
+
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+
+            return 0
+
+        return (1 - self._tokens) / self.rate
+
+
+@dataclass
+class FakeUser:
+    id: int
+    language_code: str
+    # The last bot message with an inline keyboard, its buttons are pressed by the user
+    keyboard_message: dict[str, Any] | None = None
+
+
+@dataclass
+class State:
+    users: list[FakeUser]
+    global_limit: TokenBucket
+    chat_rate: float
+    chat_burst: float
+
+    updates: deque[dict[str, Any]] = field(default_factory=deque)
+    new_updates: asyncio.Event = field(default_factory=asyncio.Event)
+    update_id: int = 0
+    message_id: int = 0
+    callback_query_id: int = 0
+    chat_limits: dict[int, TokenBucket] = field(default_factory=dict)
+    messages: dict[tuple[int, int], dict[str, Any]] = field(
+        default_factory=dict
+    )
+    stats: Counter[str] = field(default_factory=Counter)
+
+    def get_user(self, user_id: int) -> FakeUser | None:
+        index = user_id - FIRST_USER_ID
+        if 0 <= index < len(self.users):
+            return self.users[index]
+
+        return None
+
+    def add_update(self, kind: str, payload: dict[str, Any]) -> None:
+        self.update_id += 1
+        self.updates.append({"update_id": self.update_id, kind: payload})
+        self.new_updates.set()
+
+        self.stats[f"update:{kind}"] += 1
+
+    def next_message_id(self) -> int:
+        self.message_id += 1
+
+        return self.message_id
+
+
+def get_user_object(user: FakeUser) -> dict[str, Any]:
+    return {
+        "id": user.id,
+        "is_bot": False,
+        "first_name": f"User {user.id}",
+        "language_code": user.language_code,
+    }
+
+
+def get_chat_object(chat_id: int) -> dict[str, Any]:
+    return {"id": chat_id, "type": "private", "first_name": f"User {chat_id}"}
+
+
+def ok(result: Any) -> web.Response:
+    return web.json_response({"ok": True, "result": result})
+
+
+def error(code: int, description: str, **parameters: Any) -> web.Response:
+    body: dict[str, Any] = {
+        "ok": False,
+        "error_code": code,
+        "description": description,
+    }
+    if parameters:
+        body["parameters"] = parameters
+
+    return web.json_response(body, status=code)
+
+
+def parse_json(value: Any) -> Any:
+    # aiogram sends nested objects (e.g. `reply_markup`) as JSON strings
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+def get_buttons(reply_markup: Any) -> list[str]:
+    reply_markup = parse_json(reply_markup)
+    if not isinstance(reply_markup, dict):
+        return []
+
+    return [
+        button["callback_data"]
+        for row in reply_markup.get("inline_keyboard", [])
+        for button in row
+        if "callback_data" in button
+    ]
+
+
+def store_message(
+    state: State, chat_id: int, message: dict[str, Any]
+) -> dict[str, Any]:
+    state.messages[(chat_id, message["message_id"])] = message
+
+    user = state.get_user(chat_id)
+    if user is not None and get_buttons(message.get("reply_markup")):
+        user.keyboard_message = message
+
+    return message
+
+
+def new_message(
+    state: State, chat_id: int, data: dict[str, Any]
+) -> dict[str, Any]:
+    message: dict[str, Any] = {
+        "message_id": state.next_message_id(),
+        "date": int(time.time()),
+        "chat": get_chat_object(chat_id),
+        "from": BOT_USER,
+    }
+
+    reply_markup = parse_json(data.get("reply_markup"))
+    if reply_markup:
+        message["reply_markup"] = reply_markup
+
+    return message
+
+
+async def send_message(state: State, data: dict[str, Any]) -> web.Response:
+    chat_id = int(data["chat_id"])
+
+    message = new_message(state, chat_id, data)
+    message["text"] = data["text"]
+
+    return ok(store_message(state, chat_id, message))
+
+
+async def send_photo(state: State, data: dict[str, Any]) -> web.Response:
+    chat_id = int(data["chat_id"])
+
+    message = new_message(state, chat_id, data)
+    message["photo"] = [
+        {
+            "file_id": f"photo-{message['message_id']}",
+            "file_unique_id": f"photo-{message['message_id']}",
+            "width": 512,
+            "height": 512,
+        }
+    ]
+    if "caption" in data:
+        message["caption"] = data["caption"]
+
+    return ok(store_message(state, chat_id, message))
+
+
+async def edit_message(state: State, data: dict[str, Any]) -> web.Response:
+    if "inline_message_id" in data:
+        return ok(True)
+
+    chat_id = int(data["chat_id"])
+    key = (chat_id, int(data["message_id"]))
+
+    try:
+        message = state.messages[key]
+    except KeyError:
+        return error(400, "Bad Request: message to edit not found")
+
+    message = {**message, "edit_date": int(time.time())}
+    for name in ("text", "caption"):
+        if name in data:
+            message[name] = data[name]
+
+    reply_markup = parse_json(data.get("reply_markup"))
+    if reply_markup:
+        message["reply_markup"] = reply_markup
+    else:
+        message.pop("reply_markup", None)
+
+    return ok(store_message(state, chat_id, message))
+
+
+async def get_updates(state: State, data: dict[str, Any]) -> web.Response:
+    offset = int(data.get("offset", 0))
+    limit = int(data.get("limit", 100))
+    timeout = float(data.get("timeout", 0))
+
+    # Updates before the offset are confirmed by the bot
+    while state.updates and state.updates[0]["update_id"] < offset:
+        state.updates.popleft()
+
+    if not state.updates and timeout > 0:
+        state.new_updates.clear()
+
+        try:
+            await asyncio.wait_for(state.new_updates.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    return ok(list(state.updates)[:limit])
+
+
+async def answer_true(state: State, data: dict[str, Any]) -> web.Response:
+    return ok(True)
+
+
+async def get_me(state: State, data: dict[str, Any]) -> web.Response:
+    return ok(BOT_USER)
+
+
+HANDLERS = {
+    "getupdates": get_updates,
+    "sendmessage": send_message,
+    "sendphoto": send_photo,
+    "editmessagetext": edit_message,
+    "editmessagecaption": edit_message,
+    "editmessagereplymarkup": edit_message,
+    "answercallbackquery": answer_true,
+    "getme": get_me,
+}
+# Methods that send messages to a chat are limited
+LIMITED_METHODS = {
+    "sendmessage",
+    "sendphoto",
+    "editmessagetext",
+    "editmessagecaption",
+    "editmessagereplymarkup",
+}
+
+
+def check_limits(state: State, chat_id: int) -> float:
+    chat_limit = state.chat_limits.get(chat_id)
+    if chat_limit is None:
+        chat_limit = state.chat_limits[chat_id] = TokenBucket(
+            state.chat_rate, state.chat_burst
+        )
+
+    return max(state.global_limit.take(), chat_limit.take())
+
+
+async def handle(request: web.Request) -> web.Response:
+    state: State = request.app["state"]
+    method = request.match_info["method"].lower()
+
+    data: dict[str, Any] = dict(await request.post())
+    if not data and request.can_read_body:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = {}
+
+    state.stats[f"method:{method}"] += 1
+
+    if method in LIMITED_METHODS and "chat_id" in data:
+        wait = check_limits(state, int(data["chat_id"]))
+        if wait:
+            retry_after = max(1, math.ceil(wait))
+
+            state.stats["429"] += 1
+
+            return error(
+                429,
+                f"Too Many Requests: retry after {retry_after}",
+                retry_after=retry_after,
+            )
+
+    handler = HANDLERS.get(method, answer_true)
+
+    return await handler(state, data)
+
+
+def generate_update(state: State, rnd: random.Random) -> None:
+    user = rnd.choice(state.users)
+
+    if user.keyboard_message is not None and rnd.random() < 0.5:
+        buttons = get_buttons(user.keyboard_message.get("reply_markup"))
+        if buttons:
+            state.callback_query_id += 1
+            state.add_update(
+                "callback_query",
+                {
+                    "id": str(state.callback_query_id),
+                    "from": get_user_object(user),
+                    "chat_instance": str(user.id),
+                    "message": user.keyboard_message,
+                    "data": rnd.choice(buttons),
+                },
+            )
+
+            return
+
+    text = rnd.choice(COMMANDS) if rnd.random() < 0.5 else rnd.choice(TEXTS)
+
+    message: dict[str, Any] = {
+        "message_id": state.next_message_id(),
+        "date": int(time.time()),
+        "chat": get_chat_object(user.id),
+        "from": get_user_object(user),
+        "text": text,
+    }
+    if text.startswith("/"):
+        message["entities"] = [
+            {
+                "type": "bot_command",
+                "offset": 0,
+                "length": len(text.split()[0]),
+            }
+        ]
+
+    state.add_update("message", message)
+
+
+async def generate_traffic(
+    state: State, updates_per_second: float, rnd: random.Random
+) -> None:
+    if updates_per_second <= 0:
+        return
+
+    interval = 1 / updates_per_second
+    next_at = time.monotonic()
+
+    while True:
+        generate_update(state, rnd)
+
+        next_at += interval
+        await asyncio.sleep(max(0, next_at - time.monotonic()))
+
+
+async def report_stats(state: State, interval: float) -> None:
+    previous: Counter[str] = Counter()
+
+    while True:
+        await asyncio.sleep(interval)
+
+        current = Counter(state.stats)
+        delta = current - previous
+        previous = current
+
+        logger.info(
+            "Stats for the last %ss: %s, pending updates: %s",
+            interval,
+            dict(sorted(delta.items())),
+            len(state.updates),
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    rnd = random.Random(args.seed)
+
+    state = State(
+        users=[
+            FakeUser(FIRST_USER_ID + number, rnd.choice(["en", "ru"]))
+            for number in range(args.users)
+        ],
+        global_limit=TokenBucket(args.global_rate, args.global_rate),
+        chat_rate=args.chat_rate,
+        chat_burst=args.chat_burst,
+    )
+
+    app = web.Application()
+    app["state"] = state
+    app.router.add_route("*", "/bot{token}/{method}", handle)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, args.host, args.port).start()
+
+    logger.info("Fake Telegram Bot API on http://%s:%s", args.host, args.port)
+
+    tasks = [
+        asyncio.create_task(
+            generate_traffic(state, args.updates_per_second, rnd)
+        ),
+        asyncio.create_task(report_stats(state, args.stats_interval)),
+    ]
+
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument(
+        "--updates-per-second",
+        type=float,
+        default=10,
+        help="The rate of scripted updates from all users, 0 to disable",
+    )
+    parser.add_argument(
+        "--global-rate",
+        type=float,
+        default=30,
+        help="Messages per second to all chats",
+    )
+    parser.add_argument(
+        "--chat-rate",
+        type=float,
+        default=1,
+        help="Messages per second to one chat",
+    )
+    parser.add_argument("--chat-burst", type=float, default=3)
+    parser.add_argument("--stats-interval", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="INFO")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level)
+
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
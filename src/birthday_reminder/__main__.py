@@ -1,35 +1,35 @@
 import asyncio
+from datetime import timedelta
 from functools import partial
 from logging import getLogger
 from typing import Any, Coroutine
 
 from aiogram import Bot, Dispatcher, Router
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.types import BotCommand, BotCommandScopeAllPrivateChats
 from aiogram_dialog import setup_dialogs
 from fluent.runtime import FluentLocalization, FluentResourceLoader
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
-
-from birthday_reminder.adapters.database import SQLAlchemyUoW
-from birthday_reminder.adapters.database.repositories import (
-    BirthdayRemindReaderImpl,
-    CompletedBirthdayRemindReaderImpl,
-    CompletedBirthdayRemindRepoImpl,
-    UserReaderImpl,
-)
-from birthday_reminder.application.birthday_remind.queries import (
-    GetByInterval,
-)
-from birthday_reminder.application.completed_birthday_remind.commands import (
-    AddCompletedBirthdayRemind,
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from birthday_reminder.adapters.database import (
+    COMPLETED_BIRTHDAY_REMIND_STORAGES,
+    ShardLockerImpl,
 )
-from birthday_reminder.application.completed_birthday_remind.queries import (
-    GetByBirthdayRemindIDAndYear,
+from birthday_reminder.application.common import WriteBuffer
+from birthday_reminder.application.delivery.commands import (
+    ClaimDeliveriesRequest,
+    RetryPolicy,
 )
-from birthday_reminder.application.user.queries import GetByID
 
 from .adapters.database import get_engine, get_session_factory
-from .application.scheduler import nearest_birthday_reminders_producer
+from .application.scheduler import (
+    Scheduler,
+    nearest_birthday_reminders_producer,
+)
 from .config import configure_logging, load_config_from_env
+from .metrics import QUEUE_SIZE, REGISTRY, run_server
+from .presentation.bot_session import RateGovernor, RateGovernorMiddleware
 from .presentation.dialogs import (
     create_remind_dialog,
     delete_remind_dialog,
@@ -40,20 +40,44 @@ from .presentation.dialogs import (
 from .presentation.handlers import (
     dialog_exception_handler,
     language_router,
+    settings_router,
     start_router,
     stats_router,
 )
 from .presentation.middlewares import (
     DatabaseMiddleware,
     I18nMiddleware,
+    MetricsMiddleware,
     UserMiddleware,
 )
-from .presentation.scheduler import nearest_birthday_reminders_consumer
+from .presentation.scheduler import (
+    RateLimiter,
+    Renderer,
+    archive_completed,
+    archiver,
+    claim_completions,
+    claim_deliveries,
+    complete_deliveries,
+    drop_year,
+    get_stored_years,
+    nearest_birthday_reminders_claimer,
+    nearest_birthday_reminders_consumer,
+    next_occurrences_roller,
+    prepare_years,
+    producer_interactors,
+    prune_deliveries,
+    release_deliveries,
+    retry_deliveries,
+    roll_next_occurrences,
+    years_preparer,
+)
 
 logger = getLogger(__name__)
 
 # Check text in `Important`: https://docs.python.org/3/library/asyncio-task.html#asyncio.create_task
 background_tasks: set[asyncio.Task] = set()
+# Tasks are stopped on shutdown stage by stage, so every stage is stopped after the stages that feed it
+shutdown_stages: list[list[asyncio.Task]] = []
 
 
 async def set_bot_commands(bot: Bot):
@@ -66,38 +90,96 @@ async def set_bot_commands(bot: Bot):
         description="Change language",
     )
 
+    cmd_timezone = BotCommand(
+        command="timezone",
+        description="Change timezone",
+    )
+    cmd_hour = BotCommand(
+        command="hour",
+        description="Change reminder hour",
+    )
+
     # public = []
-    private = [cmd_help, cmd_language]
+    private = [cmd_help, cmd_language, cmd_timezone, cmd_hour]
 
     # await bot.set_my_commands(public, BotCommandScopeAllGroupChats())
     await bot.set_my_commands(private, BotCommandScopeAllPrivateChats())
 
 
+def create_background_task(
+    coroutine: Coroutine[Any, Any, None],
+) -> asyncio.Task:
+    task = asyncio.create_task(coroutine)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+
+    return task
+
+
 async def on_startup(
     bot: Bot,
+    scheduler: Scheduler,
     producer: Coroutine[Any, Any, None],
+    claimer: Coroutine[Any, Any, None],
     consumer: Coroutine[Any, Any, None],
+    completed_buffer_flusher: Coroutine[Any, Any, None],
+    failed_buffer_flusher: Coroutine[Any, Any, None],
+    preparer: Coroutine[Any, Any, None],
+    roller: Coroutine[Any, Any, None],
+    archiver: Coroutine[Any, Any, None] | None,
+    metrics_server: Coroutine[Any, Any, None] | None,
 ):
-    command_task = asyncio.create_task(set_bot_commands(bot))
-    background_tasks.add(command_task)
-    command_task.add_done_callback(background_tasks.discard)
+    create_background_task(set_bot_commands(bot))
+    create_background_task(preparer)
+    create_background_task(roller)
+
+    if archiver is not None:
+        create_background_task(archiver)
+
+    if metrics_server is not None:
+        create_background_task(metrics_server)
+
+    shutdown_stages.extend(
+        [
+            # No new deliveries are added or claimed after the first stages
+            [
+                create_background_task(scheduler.run()),
+                create_background_task(producer),
+            ],
+            [create_background_task(claimer)],
+            # The consumer finishes in-flight sends and releases unsent deliveries
+            [create_background_task(consumer)],
+            # Writes of the last sends are flushed
+            [
+                create_background_task(completed_buffer_flusher),
+                create_background_task(failed_buffer_flusher),
+            ],
+        ]
+    )
 
-    producer_task = asyncio.create_task(producer)
-    background_tasks.add(producer_task)
-    producer_task.add_done_callback(background_tasks.discard)
 
-    consumer_task = asyncio.create_task(consumer)
-    background_tasks.add(consumer_task)
-    consumer_task.add_done_callback(background_tasks.discard)
+async def on_shutdown(
+    shard_locker: ShardLockerImpl,
+    engine: AsyncEngine,
+):
+    for stage in shutdown_stages:
+        for task in stage:
+            task.cancel()
 
+        await asyncio.gather(*stage, return_exceptions=True)
 
-async def on_shutdown(session: AsyncSession, engine: AsyncEngine):
-    await session.close()
-    await engine.dispose()
+    shutdown_stages.clear()
 
-    for task in background_tasks:
+    tasks = list(background_tasks)
+    for task in tasks:
         task.cancel()
 
+    # Wait for the tasks to finish, so the buffered writes are flushed before the engine is disposed
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    await shard_locker.close()
+    await engine.dispose()
+
 
 async def main():
     config = load_config_from_env()
@@ -105,7 +187,22 @@ async def main():
 
     logger.debug("Config loaded", extra={"config": config})
 
-    bot = Bot(token=config.bot.token, parse_mode=None)
+    session = AiohttpSession()
+    if config.bot.api_url:
+        session.api = TelegramAPIServer.from_base(config.bot.api_url)
+
+    # All outgoing requests share one governor, so replies of handlers and reminders don't exceed the limits together
+    session.middleware(
+        RateGovernorMiddleware(
+            RateGovernor(
+                config.bot.messages_per_second,
+                config.bot.chat_messages_per_second,
+                config.bot.group_messages_per_minute / 60,
+            )
+        )
+    )
+
+    bot = Bot(token=config.bot.token, session=session, parse_mode=None)
 
     main_router = Router(name="main_router")
 
@@ -114,6 +211,7 @@ async def main():
     main_router.include_router(start_router)
     main_router.include_router(stats_router)
     main_router.include_router(language_router)
+    main_router.include_router(settings_router)
 
     main_router.include_router(create_remind_dialog)
     main_router.include_router(main_menu_dialog)
@@ -123,6 +221,9 @@ async def main():
 
     engine = get_engine(config.database)
     pool = get_session_factory(engine)
+    storage = COMPLETED_BIRTHDAY_REMIND_STORAGES[
+        config.reminder.completed_storage
+    ]
 
     l10ns = {
         locale.code: FluentLocalization(
@@ -145,33 +246,102 @@ async def main():
     for observer in main_router.observers.values():
         observer.outer_middleware.register(DatabaseMiddleware(pool))
         observer.outer_middleware.register(UserMiddleware())
+        observer.middleware.register(MetricsMiddleware())
+
+    scheduler = Scheduler()
+    shard_locker = ShardLockerImpl(engine)
+    queue = asyncio.Queue(maxsize=config.reminder.queue_size)
+    renderer = Renderer(
+        FluentResourceLoader(str(config.localization.path)),
+        [locale.code for locale in config.localization.locales],
+        config.localization.default,
+    )
 
-    session = pool()
+    QUEUE_SIZE.set_function(queue.qsize)
 
-    queue = asyncio.Queue()
-    user_reader = UserReaderImpl(session)
-    birthday_reader = BirthdayRemindReaderImpl(session)
-    completed_birthday_remind_reader = CompletedBirthdayRemindReaderImpl(
-        session
+    producer = nearest_birthday_reminders_producer(
+        config.reminder,
+        scheduler,
+        shard_locker,
+        partial(producer_interactors, pool),
+    )
+    completed_buffer = WriteBuffer(
+        partial(complete_deliveries, pool),
+        max_size=config.reminder.completed_buffer_size,
+        flush_interval=config.reminder.completed_flush_interval_ms / 1000,
+    )
+    failed_buffer = WriteBuffer(
+        partial(
+            retry_deliveries,
+            pool,
+            storage,
+            RetryPolicy(
+                config.reminder.retry_max_attempts,
+                timedelta(seconds=config.reminder.retry_base_delay),
+                timedelta(seconds=config.reminder.retry_max_delay),
+            ),
+        ),
+        max_size=config.reminder.completed_buffer_size,
+        flush_interval=config.reminder.completed_flush_interval_ms / 1000,
     )
-    completed_birthday_remind_repo = CompletedBirthdayRemindRepoImpl(session)
-    uow = SQLAlchemyUoW(session)
 
-    producer = nearest_birthday_reminders_producer(
-        config.reminder, queue, GetByInterval(birthday_reader, uow)
+    claimer = nearest_birthday_reminders_claimer(
+        queue,
+        partial(
+            claim_deliveries,
+            pool,
+            ClaimDeliveriesRequest(
+                config.reminder.outbox_batch_size,
+                timedelta(seconds=config.reminder.outbox_lease),
+            ),
+        ),
+        renderer,
+        config.reminder.outbox_poll_interval_ms / 1000,
+        config.reminder.digest,
+        partial(release_deliveries, pool, storage),
     )
     consumer = nearest_birthday_reminders_consumer(
         queue,
-        GetByID(user_reader, uow),
-        GetByBirthdayRemindIDAndYear(completed_birthday_remind_reader, uow),
-        AddCompletedBirthdayRemind(completed_birthday_remind_repo, uow),
+        partial(claim_completions, pool, storage),
+        renderer,
+        completed_buffer,
+        failed_buffer,
         bot,
-        l10ns,
-        config.localization.default,
+        RateLimiter(config.reminder.messages_per_second),
+        config.reminder.workers,
+        partial(release_deliveries, pool, storage),
+        config.reminder.shutdown_timeout,
     )
 
-    main_router.startup.register(partial(on_startup, bot, producer, consumer))
-    main_router.shutdown.register(partial(on_shutdown, session, engine))
+    main_router.startup.register(
+        partial(
+            on_startup,
+            bot,
+            scheduler,
+            producer,
+            claimer,
+            consumer,
+            completed_buffer.run(),
+            failed_buffer.run(),
+            years_preparer(partial(prepare_years, pool, storage)),
+            next_occurrences_roller(
+                partial(roll_next_occurrences, pool), config.reminder.tz
+            ),
+            archiver(
+                partial(get_stored_years, pool, storage),
+                partial(archive_completed, pool, storage),
+                partial(drop_year, pool, storage),
+                partial(prune_deliveries, pool),
+                config.retention,
+            )
+            if config.retention.enabled
+            else None,
+            run_server(REGISTRY, config.metrics.host, config.metrics.port)
+            if config.metrics.enabled
+            else None,
+        )
+    )
+    main_router.shutdown.register(partial(on_shutdown, shard_locker, engine))
 
     dispatcher = Dispatcher()
     dispatcher.include_router(main_router)
@@ -1,4 +1,16 @@
-__all__ = ["SQLAlchemyUoW", "get_engine", "get_session_factory"]
+__all__ = [
+    "COMPLETED_BIRTHDAY_REMIND_STORAGES",
+    "CompletedBirthdayRemindStorage",
+    "SQLAlchemyUoW",
+    "ShardLockerImpl",
+    "get_engine",
+    "get_session_factory",
+]
 
+from .completed_storage import (
+    COMPLETED_BIRTHDAY_REMIND_STORAGES,
+    CompletedBirthdayRemindStorage,
+)
 from .main import get_engine, get_session_factory
+from .shard_locker import ShardLockerImpl
 from .uow import SQLAlchemyUoW
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindReader,
+    CompletedBirthdayRemindRepo,
+)
+
+from .repositories import (
+    CompletedBirthdayRemindFlagsReaderImpl,
+    CompletedBirthdayRemindFlagsRepoImpl,
+    CompletedBirthdayRemindReaderImpl,
+    CompletedBirthdayRemindRepoImpl,
+)
+
+
+@dataclass(frozen=True)
+class CompletedBirthdayRemindStorage:
+    """
+    Factories of the repo and the reader of completed reminders of one storage mode.
+    """
+
+    repo: Callable[[AsyncSession], CompletedBirthdayRemindRepo]
+    reader: Callable[[AsyncSession], CompletedBirthdayRemindReader]
+
+
+COMPLETED_BIRTHDAY_REMIND_STORAGES = {
+    # A row for every completed reminder in the table partitioned by year
+    "rows": CompletedBirthdayRemindStorage(
+        CompletedBirthdayRemindRepoImpl, CompletedBirthdayRemindReaderImpl
+    ),
+    # A bit for every reminder type in a narrow row for every reminder and year
+    "bitmask": CompletedBirthdayRemindStorage(
+        CompletedBirthdayRemindFlagsRepoImpl,
+        CompletedBirthdayRemindFlagsReaderImpl,
+    ),
+}
@@ -1,7 +1,17 @@
-from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
+from birthday_reminder.domain.birthday_remind.entities import (
+    BirthdayRemind,
+    BirthdayRemindWithUser,
+)
 from birthday_reminder.domain.completed_birthday_remind.entities import (
     CompletedBirthdayRemind,
 )
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryWithRemind,
+)
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
 from birthday_reminder.domain.user.entities import User
 
 from . import models
@@ -12,6 +22,8 @@ def model_to_user(user: models.User) -> User:
         id=user.id,
         language_code=user.language_code,
         tg_id=user.tg_id,
+        timezone=user.timezone,
+        reminder_hour=user.reminder_hour,
     )
 
 
@@ -20,6 +32,8 @@ def user_to_model(user: User) -> models.User:
         id=user.id,
         language_code=user.language_code,
         tg_id=user.tg_id,
+        timezone=user.timezone,
+        reminder_hour=user.reminder_hour,
     )
 
 
@@ -32,6 +46,7 @@ def model_to_birthday_remind(
         name=birthday_remind.name,
         day=birthday_remind.day,
         month=birthday_remind.month,
+        next_occurrence=birthday_remind.next_occurrence,
     )
 
 
@@ -44,6 +59,17 @@ def birthday_remind_to_model(
         name=birthday_remind.name,
         day=birthday_remind.day,
         month=birthday_remind.month,
+        next_occurrence=birthday_remind.next_occurrence,
+    )
+
+
+def models_to_birthday_remind_with_user(
+    birthday_remind: models.BirthdayRemind,
+    user: models.User,
+) -> BirthdayRemindWithUser:
+    return BirthdayRemindWithUser(
+        remind=model_to_birthday_remind(birthday_remind),
+        user=model_to_user(user),
     )
 
 
@@ -67,3 +93,34 @@ def model_to_completed_birthday_remind(
         year=completed_birthday_remind.year,
         reminder_type=completed_birthday_remind.reminder_type,
     )
+
+
+def model_to_scheduler_checkpoint(
+    scheduler_checkpoint: models.SchedulerCheckpoint,
+) -> SchedulerCheckpoint:
+    return SchedulerCheckpoint(
+        name=scheduler_checkpoint.name,
+        processed_at=scheduler_checkpoint.processed_at,
+    )
+
+
+def model_to_delivery(delivery: models.Delivery) -> Delivery:
+    return Delivery(
+        id=delivery.id,
+        birthday_remind_id=delivery.birthday_remind_id,
+        year=delivery.year,
+        reminder_type=delivery.reminder_type,
+        attempts=delivery.attempts,
+    )
+
+
+def models_to_delivery_with_remind(
+    delivery: models.Delivery,
+    birthday_remind: models.BirthdayRemind,
+    user: models.User,
+) -> DeliveryWithRemind:
+    return DeliveryWithRemind(
+        delivery=model_to_delivery(delivery),
+        remind=model_to_birthday_remind(birthday_remind),
+        user=model_to_user(user),
+    )
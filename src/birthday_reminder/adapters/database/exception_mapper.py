@@ -1,10 +1,12 @@
-from collections.abc import Callable
+import time
+from collections.abc import AsyncIterator, Callable
 from functools import wraps
 from typing import Any, Coroutine, ParamSpec, TypeVar
 
 from sqlalchemy.exc import SQLAlchemyError
 
 from birthday_reminder.application.common.exceptions import RepoError
+from birthday_reminder.metrics import DB_QUERY_SECONDS
 
 Param = ParamSpec("Param")
 ReturnType = TypeVar("ReturnType")
@@ -14,11 +16,46 @@ Func = Callable[Param, ReturnType]
 def exception_mapper(
     func: Callable[Param, Coroutine[Any, Any, ReturnType]],
 ) -> Callable[Param, Coroutine[Any, Any, ReturnType]]:
+    method = func.__qualname__
+
     @wraps(func)
     async def wrapped(*args: Param.args, **kwargs: Param.kwargs) -> ReturnType:
+        started_at = time.perf_counter()
         try:
             return await func(*args, **kwargs)
         except SQLAlchemyError as err:
             raise RepoError from err
+        finally:
+            DB_QUERY_SECONDS.observe(time.perf_counter() - started_at, method)
+
+    return wrapped
+
+
+def stream_exception_mapper(
+    func: Callable[Param, AsyncIterator[ReturnType]],
+) -> Callable[Param, AsyncIterator[ReturnType]]:
+    method = func.__qualname__
+
+    @wraps(func)
+    async def wrapped(
+        *args: Param.args, **kwargs: Param.kwargs
+    ) -> AsyncIterator[ReturnType]:
+        iterator = aiter(func(*args, **kwargs))
+
+        # Only fetching is measured, not the time the caller spends between items
+        while True:
+            started_at = time.perf_counter()
+            try:
+                item = await anext(iterator)
+            except StopAsyncIteration:
+                break
+            except SQLAlchemyError as err:
+                raise RepoError from err
+            finally:
+                DB_QUERY_SECONDS.observe(
+                    time.perf_counter() - started_at, method
+                )
+
+            yield item
 
     return wrapped
@@ -0,0 +1,135 @@
+"""partition-completed-birthday-reminds-by-year
+
+Revision ID: e6c4f5a7b8d9
+Revises: d5b3e4f6a7c8
+Create Date: 2026-10-18 17:30:00.000000
+
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "e6c4f5a7b8d9"
+down_revision: Union[str, None] = "d5b3e4f6a7c8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE_NAME = "completed_birthday_reminds"
+OLD_TABLE_NAME = "completed_birthday_reminds_old"
+COLUMNS = "id, birthday_remind_id, year, reminder_type, created_at, updated_at"
+
+
+def create_table(partitioned: bool) -> None:
+    op.create_table(
+        TABLE_NAME,
+        sa.Column(
+            "id",
+            sa.Uuid(),
+            server_default=sa.text("uuid_generate_v7()"),
+            nullable=False,
+        ),
+        sa.Column("birthday_remind_id", sa.Uuid(), nullable=False),
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column(
+            "reminder_type",
+            postgresql.ENUM(
+                "BeforehandInOneDay",
+                "OnTheDay",
+                name="remindertype",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["birthday_remind_id"],
+            ["birthday_reminds.id"],
+            name=op.f(
+                "fk_completed_birthday_reminds_birthday_remind_id_birthday_reminds"
+            ),
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        sa.PrimaryKeyConstraint(
+            *(["id", "year"] if partitioned else ["id"]),
+            name=op.f("pk_completed_birthday_reminds"),
+        ),
+        sa.UniqueConstraint(
+            "birthday_remind_id",
+            "year",
+            "reminder_type",
+            name=op.f(
+                "uq_completed_birthday_reminds_birthday_remind_id_year_reminder_type"
+            ),
+        ),
+        **({"postgresql_partition_by": "RANGE (year)"} if partitioned else {}),
+    )
+
+
+def rename_to_old() -> None:
+    # The constraints are dropped, because their indexes would clash with the ones of the new table
+    op.rename_table(TABLE_NAME, OLD_TABLE_NAME)
+    op.drop_constraint(
+        op.f(
+            "uq_completed_birthday_reminds_birthday_remind_id_year_reminder_type"
+        ),
+        OLD_TABLE_NAME,
+        type_="unique",
+    )
+    op.drop_constraint(
+        op.f("pk_completed_birthday_reminds"),
+        OLD_TABLE_NAME,
+        type_="primary",
+    )
+
+
+def copy_from_old() -> None:
+    op.execute(
+        f"INSERT INTO {TABLE_NAME} ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM {OLD_TABLE_NAME}"
+    )
+    op.drop_table(OLD_TABLE_NAME)
+
+
+def upgrade() -> None:
+    rename_to_old()
+    create_table(partitioned=True)
+
+    # Partitions of later years are created by the bot
+    current_year = datetime.now(tz=timezone.utc).year
+    years = set(
+        op.get_bind()
+        .execute(sa.text(f"SELECT DISTINCT year FROM {OLD_TABLE_NAME}"))
+        .scalars()
+    )
+    years.update(range(current_year - 1, current_year + 2))
+
+    for year in sorted(years):
+        op.execute(
+            f"CREATE TABLE {TABLE_NAME}_y{year:d} PARTITION OF {TABLE_NAME} "
+            f"FOR VALUES FROM ({year:d}) TO ({year + 1:d})"
+        )
+
+    copy_from_old()
+
+
+def downgrade() -> None:
+    # Partitions are dropped together with the old table
+    rename_to_old()
+    create_table(partitioned=False)
+    copy_from_old()
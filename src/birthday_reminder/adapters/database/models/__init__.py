@@ -1,6 +1,19 @@
-__all__ = ["BirthdayRemind", "CompletedBirthdayRemind", "User", "BaseModel"]
+__all__ = [
+    "BirthdayRemind",
+    "CompletedBirthdayRemind",
+    "CompletedBirthdayRemindArchive",
+    "CompletedBirthdayRemindFlags",
+    "Delivery",
+    "SchedulerCheckpoint",
+    "User",
+    "BaseModel",
+]
 
 from .base import BaseModel
 from .birthday_remind import BirthdayRemind
 from .completed_birthday_remind import CompletedBirthdayRemind
+from .completed_birthday_remind_archive import CompletedBirthdayRemindArchive
+from .completed_birthday_remind_flags import CompletedBirthdayRemindFlags
+from .delivery import Delivery
+from .scheduler_checkpoint import SchedulerCheckpoint
 from .user import User
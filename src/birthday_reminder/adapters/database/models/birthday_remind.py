@@ -1,3 +1,4 @@
+from datetime import date
 from uuid import UUID
 
 import sqlalchemy as sa
@@ -10,6 +11,18 @@ from .base import TimedBaseModel
 class BirthdayRemind(TimedBaseModel):
     __tablename__ = "birthday_reminds"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Used to select reminders of a date interval by range scans
+        sa.Index("ix_birthday_reminds_month_day", "month_day"),
+        # Covers the per-user readers, so they're index-only scans, and the cascade from `users`.
+        # Reminders of a user are read in the order of the index, so the nearest ones go first without sorting.
+        sa.Index(
+            "ix_birthday_reminds_user_id_next_occurrence",
+            "user_id",
+            "next_occurrence",
+            postgresql_include=["id", "name", "day", "month"],
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -27,3 +40,8 @@ class BirthdayRemind(TimedBaseModel):
     name: Mapped[str] = mapped_column(nullable=False)
     day: Mapped[int] = mapped_column(nullable=False)
     month: Mapped[int] = mapped_column(nullable=False)
+    # The date in the `MMDD` form, so dates are ordered like the calendar and an interval is a range
+    month_day: Mapped[int] = mapped_column(
+        sa.Computed("month * 100 + day", persisted=True)
+    )
+    next_occurrence: Mapped[date] = mapped_column(nullable=False)
@@ -1,7 +1,6 @@
 from uuid import UUID
 
 import sqlalchemy as sa
-from sqlalchemy import UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column
 from uuid6 import uuid7
 
@@ -15,6 +14,12 @@ from .base import TimedBaseModel
 class CompletedBirthdayRemind(TimedBaseModel):
     __tablename__ = "completed_birthday_reminds"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Created on every partition, so the lookup of a reminder of the year is a probe of the partition's index
+        sa.UniqueConstraint("birthday_remind_id", "year", "reminder_type"),
+        # Partitions are yearly, so old years are dropped or detached without deleting rows
+        {"postgresql_partition_by": "RANGE (year)"},
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -29,7 +34,6 @@ class CompletedBirthdayRemind(TimedBaseModel):
         ),
         nullable=False,
     )
-    year: Mapped[int] = mapped_column(nullable=False)
+    # Keys of a partitioned table must include the partition key
+    year: Mapped[int] = mapped_column(primary_key=True)
     reminder_type: Mapped[ReminderType] = mapped_column(nullable=False)
-
-    UniqueConstraint(birthday_remind_id, year, reminder_type)
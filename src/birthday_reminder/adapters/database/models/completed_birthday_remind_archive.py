@@ -0,0 +1,30 @@
+import datetime
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    ReminderType,
+)
+
+from .base import BaseModel
+
+
+class CompletedBirthdayRemindArchive(BaseModel):
+    """
+    Completed reminders of old years moved out of `completed_birthday_reminds`.
+    Timestamps are copied from the original rows, and there is no foreign key, so the history outlives deleted reminders.
+    """
+
+    __tablename__ = "completed_birthday_reminds_archive"
+
+    id: Mapped[UUID] = mapped_column(primary_key=True)
+    birthday_remind_id: Mapped[UUID] = mapped_column(nullable=False)
+    year: Mapped[int] = mapped_column(nullable=False)
+    reminder_type: Mapped[ReminderType] = mapped_column(nullable=False)
+    created_at: Mapped[datetime.datetime] = mapped_column(nullable=False)
+    updated_at: Mapped[datetime.datetime] = mapped_column(nullable=False)
+    archived_at: Mapped[datetime.datetime] = mapped_column(
+        nullable=False, server_default=sa.func.now()
+    )
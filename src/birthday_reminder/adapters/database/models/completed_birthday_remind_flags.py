@@ -0,0 +1,32 @@
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class CompletedBirthdayRemindFlags(BaseModel):
+    """
+    A compact storage of completed reminders: one narrow row per reminder and year
+    with a bit for every reminder type instead of a row for every delivery.
+    """
+
+    __tablename__ = "completed_birthday_remind_flags"
+    __table_args__ = (
+        # Used to find stored years for the retention
+        sa.Index("ix_completed_birthday_remind_flags_year", "year"),
+    )
+
+    birthday_remind_id: Mapped[UUID] = mapped_column(
+        sa.ForeignKey(
+            "birthday_reminds.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        primary_key=True,
+    )
+    year: Mapped[int] = mapped_column(primary_key=True)
+    flags: Mapped[int] = mapped_column(
+        sa.SmallInteger(), nullable=False, server_default=sa.text("0")
+    )
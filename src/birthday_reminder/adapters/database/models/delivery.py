@@ -0,0 +1,59 @@
+from datetime import datetime
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+from uuid6 import uuid7
+
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    ReminderType,
+)
+
+from .base import TimedBaseModel
+
+
+class Delivery(TimedBaseModel):
+    __tablename__ = "delivery_outbox"
+    __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # A reminder is delivered once per year and type, so the producer can add it many times
+        sa.UniqueConstraint("birthday_remind_id", "year", "reminder_type"),
+        # Used by consumers to claim pending deliveries in the order they were added
+        sa.Index(
+            "ix_delivery_outbox_pending",
+            "id",
+            postgresql_where=sa.text("done_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[UUID] = mapped_column(
+        primary_key=True,
+        default=uuid7,
+        server_default=sa.func.uuid_generate_v7(),
+    )
+    birthday_remind_id: Mapped[UUID] = mapped_column(
+        sa.ForeignKey(
+            "birthday_reminds.id",
+            onupdate="CASCADE",
+            ondelete="CASCADE",
+        ),
+        nullable=False,
+    )
+    year: Mapped[int] = mapped_column(nullable=False)
+    reminder_type: Mapped[ReminderType] = mapped_column(nullable=False)
+    # The delivery can't be claimed by another consumer until the lease expires.
+    # A failed delivery isn't claimed until its retry time, and a replayed one until its paced time, which are set here too.
+    locked_until: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=True
+    )
+    done_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=True
+    )
+    attempts: Mapped[int] = mapped_column(
+        nullable=False, default=0, server_default=sa.text("0")
+    )
+    last_error: Mapped[str] = mapped_column(sa.Text(), nullable=True)
+    # Set with `done_at` when the delivery is given up after the last attempt
+    failed_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=True
+    )
@@ -0,0 +1,16 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import TimedBaseModel
+
+
+class SchedulerCheckpoint(TimedBaseModel):
+    __tablename__ = "scheduler_checkpoints"
+    __mapper_args__ = {"eager_defaults": True}
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    processed_at: Mapped[datetime] = mapped_column(
+        sa.DateTime(timezone=True), nullable=False
+    )
@@ -10,6 +10,14 @@ from .base import TimedBaseModel
 class User(TimedBaseModel):
     __tablename__ = "users"
     __mapper_args__ = {"eager_defaults": True}
+    __table_args__ = (
+        # Used by the scheduler to select users of the current delivery slot
+        sa.Index(
+            "ix_users_timezone_reminder_hour",
+            "timezone",
+            "reminder_hour",
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(
         primary_key=True,
@@ -18,3 +26,6 @@ class User(TimedBaseModel):
     )
     language_code: Mapped[str] = mapped_column(nullable=True)
     tg_id: Mapped[int] = mapped_column(unique=True, nullable=False)
+    # If the timezone or the hour isn't set, the values from the config are used
+    timezone: Mapped[str] = mapped_column(nullable=True)
+    reminder_hour: Mapped[int] = mapped_column(nullable=True)
@@ -5,6 +5,11 @@ __all__ = [
     "BirthdayRemindRepoImpl",
     "CompletedBirthdayRemindReaderImpl",
     "CompletedBirthdayRemindRepoImpl",
+    "CompletedBirthdayRemindFlagsReaderImpl",
+    "CompletedBirthdayRemindFlagsRepoImpl",
+    "DeliveryRepoImpl",
+    "SchedulerCheckpointReaderImpl",
+    "SchedulerCheckpointRepoImpl",
 ]
 
 from .birthday_remind import BirthdayRemindReaderImpl, BirthdayRemindRepoImpl
@@ -12,4 +17,13 @@ from .completed_birthday_remind import (
     CompletedBirthdayRemindReaderImpl,
     CompletedBirthdayRemindRepoImpl,
 )
+from .completed_birthday_remind_flags import (
+    CompletedBirthdayRemindFlagsReaderImpl,
+    CompletedBirthdayRemindFlagsRepoImpl,
+)
+from .delivery import DeliveryRepoImpl
+from .scheduler_checkpoint import (
+    SchedulerCheckpointReaderImpl,
+    SchedulerCheckpointRepoImpl,
+)
 from .user import UserReaderImpl, UserRepoImpl
@@ -1,11 +1,27 @@
-from datetime import timedelta
+from datetime import date, timedelta
+from typing import AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import case, delete, func, select
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Text,
+    and_,
+    case,
+    cast,
+    delete,
+    func,
+    select,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.orm import QueryableAttribute, aliased, load_only
 
 from birthday_reminder.adapters.database.converters import (
     birthday_remind_to_model,
     model_to_birthday_remind,
+    models_to_birthday_remind_with_user,
 )
 from birthday_reminder.application.birthday_remind import (
     BirthdayRemindReader,
@@ -14,14 +30,115 @@ from birthday_reminder.application.birthday_remind import (
 from birthday_reminder.domain.birthday_remind.entities import (
     BirthdayRemind,
     BirthdayRemindersStats,
+    BirthdayRemindWithUser,
 )
 from birthday_reminder.domain.birthday_remind.exceptions import IDNotFound
+from birthday_reminder.domain.birthday_remind.services import (
+    get_occurrence_day,
+)
 
-from ..exception_mapper import exception_mapper
+from ..exception_mapper import exception_mapper, stream_exception_mapper
 from ..models import BirthdayRemind as BirthdayRemindModel
+from ..models import User as UserModel
 from .base import Repo
 
 
+def get_month_day(day: int, month: int) -> int:
+    return month * 100 + day
+
+
+def interval_filters(
+    start_day: int,
+    start_month: int,
+    end_day: int,
+    end_month: int,
+) -> list[ColumnElement[bool]]:
+    """
+    Get range filters of the interval on the indexed `month_day` column.
+    If the interval includes the end and the beginning of the year, it's split into two ranges.
+    """
+
+    start = get_month_day(start_day, start_month)
+    end = get_month_day(end_day, end_month)
+
+    if start > end:
+        return [
+            BirthdayRemindModel.month_day >= start,
+            BirthdayRemindModel.month_day <= end,
+        ]
+
+    return [BirthdayRemindModel.month_day.between(start, end)]
+
+
+def covered_columns(
+    birthday_remind: type[BirthdayRemindModel],
+) -> tuple[QueryableAttribute, ...]:
+    """
+    Get columns of the entity included in the `(user_id, next_occurrence)` index.
+    Selecting only them lets per-user queries be index-only scans.
+    """
+
+    return (
+        birthday_remind.user_id,
+        birthday_remind.name,
+        birthday_remind.day,
+        birthday_remind.month,
+        birthday_remind.next_occurrence,
+    )
+
+
+def occurrence(year: int) -> ColumnElement[date]:
+    # The leap day is resolved for the year here, so the statement has no calendar logic of its own
+    return func.make_date(
+        year,
+        BirthdayRemindModel.month,
+        case(
+            (
+                and_(
+                    BirthdayRemindModel.month == 2,
+                    BirthdayRemindModel.day == 29,
+                ),
+                get_occurrence_day(29, 2, year),
+            ),
+            else_=BirthdayRemindModel.day,
+        ),
+        type_=Date,
+    )
+
+
+def slot_filter(
+    timezones: list[str],
+    include_unset_timezone: bool,
+    hours: list[int],
+    include_unset_hour: bool,
+) -> ColumnElement[bool]:
+    # Users without the timezone or the hour get the values from the config,
+    # so they are selected together with users who set the same values explicitly.
+    timezone_filter = UserModel.timezone.in_(timezones)
+    if include_unset_timezone:
+        timezone_filter |= UserModel.timezone.is_(None)
+
+    hour_filter = UserModel.reminder_hour.in_(hours)
+    if include_unset_hour:
+        hour_filter |= UserModel.reminder_hour.is_(None)
+
+    return timezone_filter & hour_filter
+
+
+def shard_filter(shard: int, shard_count: int) -> ColumnElement[bool]:
+    if shard_count == 1:
+        return true()
+
+    # The sign bit is dropped, because `abs` overflows on the minimal integer
+    return (
+        func.hashtext(cast(BirthdayRemindModel.user_id, Text)).op("&")(
+            0x7FFFFFFF
+        )
+        % shard_count
+        == shard
+    )
+
+
 class BirthdayRemindRepoImpl(Repo, BirthdayRemindRepo):
     @exception_mapper
     async def add(self, birthday_remind: BirthdayRemind) -> None:
@@ -35,6 +152,25 @@ class BirthdayRemindRepoImpl(Repo, BirthdayRemindRepo):
             delete(BirthdayRemindModel).filter(BirthdayRemindModel.id == id)
         )
 
+    @exception_mapper
+    async def roll_next_occurrences(self, today: date) -> int:
+        this_year = occurrence(today.year)
+
+        # Only reminders whose birthday has passed are updated, the rest of the table isn't touched
+        result = await self._session.execute(
+            update(BirthdayRemindModel)
+            .where(BirthdayRemindModel.next_occurrence < today)
+            .values(
+                next_occurrence=case(
+                    (this_year >= today, this_year),
+                    else_=occurrence(today.year + 1),
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+        return result.rowcount
+
 
 class BirthdayRemindReaderImpl(Repo, BirthdayRemindReader):
     @exception_mapper
@@ -51,9 +187,9 @@ class BirthdayRemindReaderImpl(Repo, BirthdayRemindReader):
     @exception_mapper
     async def get_by_user_id(self, user_id: UUID) -> list[BirthdayRemind]:
         birthday_reminds = await self._session.scalars(
-            select(BirthdayRemindModel).filter(
-                BirthdayRemindModel.user_id == user_id
-            )
+            select(BirthdayRemindModel)
+            .options(load_only(*covered_columns(BirthdayRemindModel)))
+            .filter(BirthdayRemindModel.user_id == user_id)
         )
 
         return [
@@ -63,43 +199,14 @@ class BirthdayRemindReaderImpl(Repo, BirthdayRemindReader):
 
     @exception_mapper
     async def get_by_user_id_and_sort_by_nearest(
-        self, user_id: UUID, now_day: int, now_month: int
+        self, user_id: UUID
     ) -> list[BirthdayRemind]:
+        # Reminders are read in the order of the `(user_id, next_occurrence)` index, so there's no sort
         birthday_reminds = await self._session.scalars(
             select(BirthdayRemindModel)
+            .options(load_only(*covered_columns(BirthdayRemindModel)))
             .filter(BirthdayRemindModel.user_id == user_id)
-            .order_by(
-                # Sort by the difference between the current month and the month of the birthday in ascending order.
-                # If the month of the birthday has already passed this year, it will be in the end,
-                # and if the month of the birthday has not yet passed this year, it will be in the start
-                # where the first place will be the birthday that is closest to the current month.
-                case(
-                    # If the month of the birthday has already passed this year,
-                    # we need to calculate the difference between the current month
-                    # and the month of the birthday next year.
-                    (
-                        (BirthdayRemindModel.month - now_month) < 0,
-                        12 + (BirthdayRemindModel.month - now_month),
-                    ),
-                    # If the month of the birthday is the current month
-                    # and the day of the birthday has already passed this month,
-                    # so we need to pass `12` to the `case` function to sort it in the end.
-                    (
-                        ((BirthdayRemindModel.month - now_month) == 0)
-                        & (BirthdayRemindModel.day - now_day < 0),
-                        12,
-                    ),
-                    # If the month of the birthday has not yet passed this year,
-                    # we need to calculate the difference between the current month
-                    # and the month of the birthday this year.
-                    else_=BirthdayRemindModel.month - now_month,
-                ).asc(),
-                # Sort by the difference between the current day and the day of the birthday in ascending order.
-                # Cases when the month of the birthday is the current month and the day of the birthday has already passed this month
-                # are already sorted by the previous case,
-                # so we just sort by the difference between the current day and the day of the birthday.
-                (BirthdayRemindModel.day - now_day).asc(),
-            )
+            .order_by(BirthdayRemindModel.next_occurrence)
         )
 
         return [
@@ -129,67 +236,56 @@ class BirthdayRemindReaderImpl(Repo, BirthdayRemindReader):
 
         return BirthdayRemindersStats(*result.one())
 
-    @exception_mapper
-    async def get_by_interval(
+    @stream_exception_mapper
+    async def stream_by_slot(
         self,
+        timezones: list[str],
+        include_unset_timezone: bool,
+        hours: list[int],
+        include_unset_hour: bool,
         start_day: int,
         start_month: int,
         end_day: int,
         end_month: int,
-    ) -> list[BirthdayRemind]:
-        if start_month > end_month:
-            # If the start month is greater than the end month,
-            # it means that the interval includes the end of the year and the beginning of the year.
-            # So we need to get birthday reminders for the end of the year and the beginning of the year separately.
-            birthday_reminds = await self._session.scalars(
+        shard: int,
+        shard_count: int,
+        batch_size: int,
+    ) -> AsyncIterator[list[BirthdayRemindWithUser]]:
+        # A year-wrapping interval is a union of two range scans of the `month_day` index instead of one `OR` predicate
+        interval = union_all(
+            *(
                 select(BirthdayRemindModel).where(
-                    (
-                        (BirthdayRemindModel.month == start_month)
-                        & (BirthdayRemindModel.day >= start_day)
-                    )
-                    | (
-                        (BirthdayRemindModel.month == end_month)
-                        & (BirthdayRemindModel.day <= end_day)
-                    )
-                    | (
-                        (BirthdayRemindModel.month > start_month)
-                        & (BirthdayRemindModel.month <= 12)
-                    )
-                    | (
-                        (BirthdayRemindModel.month >= 1)
-                        & (BirthdayRemindModel.month < end_month)
-                    )
+                    filter, shard_filter(shard, shard_count)
                 )
-            )
-        elif start_month < end_month:
-            birthday_reminds = await self._session.scalars(
-                select(BirthdayRemindModel).where(
-                    (
-                        (BirthdayRemindModel.month == start_month)
-                        & (BirthdayRemindModel.day >= start_day)
-                    )
-                    | (
-                        (BirthdayRemindModel.month == end_month)
-                        & (BirthdayRemindModel.day <= end_day)
-                    )
-                    | (
-                        (BirthdayRemindModel.month > start_month)
-                        & (BirthdayRemindModel.month < end_month)
-                    )
+                for filter in interval_filters(
+                    start_day, start_month, end_day, end_month
                 )
             )
-        else:
-            month = start_month
+        ).subquery()
+        interval_remind = aliased(BirthdayRemindModel, interval)
 
-            birthday_reminds = await self._session.scalars(
-                select(BirthdayRemindModel).where(
-                    (BirthdayRemindModel.month == month)
-                    & (BirthdayRemindModel.day >= start_day)
-                    & (BirthdayRemindModel.day <= end_day)
+        # Rows are fetched by a server-side cursor in batches of `batch_size`,
+        # so the whole interval is never loaded into memory.
+        # Users are joined to avoid a separate query for every reminder's user.
+        result = await self._session.stream(
+            select(interval_remind, UserModel)
+            .join(UserModel, UserModel.id == interval_remind.user_id)
+            .where(
+                slot_filter(
+                    timezones,
+                    include_unset_timezone,
+                    hours,
+                    include_unset_hour,
                 )
             )
+            # Reminders of a user are added to the outbox next to each other,
+            # so they are claimed by one batch and can be sent as one message.
+            .order_by(interval_remind.user_id)
+            .execution_options(yield_per=batch_size)
+        )
 
-        return [
-            model_to_birthday_remind(birthday_remind)
-            for birthday_remind in birthday_reminds
-        ]
+        async for partition in result.partitions():
+            yield [
+                models_to_birthday_remind_with_user(birthday_remind, user)
+                for birthday_remind, user in partition
+            ]
@@ -1,9 +1,9 @@
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import delete, exists, select, text, tuple_
+from sqlalchemy.dialects.postgresql import Insert, insert
 
 from birthday_reminder.adapters.database.converters import (
-    completed_birthday_remind_to_model,
     model_to_completed_birthday_remind,
 )
 from birthday_reminder.application.completed_birthday_remind import (
@@ -12,47 +12,193 @@ from birthday_reminder.application.completed_birthday_remind import (
 )
 from birthday_reminder.domain.completed_birthday_remind.entities import (
     CompletedBirthdayRemind,
-    ReminderType,
-)
-from birthday_reminder.domain.completed_birthday_remind.exceptions import (
-    IDForYearAndTypeNotFound,
 )
 
 from ..exception_mapper import exception_mapper
 from ..models import CompletedBirthdayRemind as CompletedBirthdayRemindModel
+from ..models import (
+    CompletedBirthdayRemindArchive as CompletedBirthdayRemindArchiveModel,
+)
 from .base import Repo
 
+PARTITION_PREFIX = f"{CompletedBirthdayRemindModel.__tablename__}_y"
+# Columns copied to the archive
+ARCHIVED_COLUMNS = [
+    "id",
+    "birthday_remind_id",
+    "year",
+    "reminder_type",
+    "created_at",
+    "updated_at",
+]
+
+
+def get_partition_name(year: int) -> str:
+    return f"{PARTITION_PREFIX}{year}"
+
+
+def insert_new_statement(
+    completed_birthday_reminds: list[CompletedBirthdayRemind],
+) -> Insert:
+    # One multi-row INSERT for all records of a payload.
+    # Records that are already written (e.g. by a previous send) are skipped by the unique index.
+    return (
+        insert(CompletedBirthdayRemindModel)
+        .values(
+            [
+                {
+                    "id": completed_birthday_remind.id,
+                    "birthday_remind_id": completed_birthday_remind.birthday_remind_id,
+                    "year": completed_birthday_remind.year,
+                    "reminder_type": completed_birthday_remind.reminder_type,
+                }
+                for completed_birthday_remind in completed_birthday_reminds
+            ]
+        )
+        .on_conflict_do_nothing(
+            index_elements=[
+                CompletedBirthdayRemindModel.birthday_remind_id,
+                CompletedBirthdayRemindModel.year,
+                CompletedBirthdayRemindModel.reminder_type,
+            ]
+        )
+    )
+
 
 class CompletedBirthdayRemindRepoImpl(Repo, CompletedBirthdayRemindRepo):
     @exception_mapper
-    async def add(
-        self, completed_birthday_remind: CompletedBirthdayRemind
-    ) -> None:
-        self._session.add(
-            completed_birthday_remind_to_model(completed_birthday_remind)
+    async def claim_many(
+        self, completed_birthday_reminds: list[CompletedBirthdayRemind]
+    ) -> list[CompletedBirthdayRemind]:
+        if not completed_birthday_reminds:
+            return []
+
+        # Only rows inserted by this statement are returned, so concurrent claims of a reminder can't both succeed
+        claimed = await self._session.scalars(
+            insert_new_statement(completed_birthday_reminds).returning(
+                CompletedBirthdayRemindModel
+            )
         )
 
-        await self._session.flush()
+        return [
+            model_to_completed_birthday_remind(completed_birthday_remind)
+            for completed_birthday_remind in claimed
+        ]
 
+    @exception_mapper
+    async def delete_many(
+        self, completed_birthday_reminds: list[CompletedBirthdayRemind]
+    ) -> None:
+        if not completed_birthday_reminds:
+            return
+
+        await self._session.execute(
+            delete(CompletedBirthdayRemindModel).where(
+                tuple_(
+                    CompletedBirthdayRemindModel.birthday_remind_id,
+                    CompletedBirthdayRemindModel.year,
+                    CompletedBirthdayRemindModel.reminder_type,
+                ).in_(
+                    [
+                        (
+                            completed_birthday_remind.birthday_remind_id,
+                            completed_birthday_remind.year,
+                            completed_birthday_remind.reminder_type,
+                        )
+                        for completed_birthday_remind in completed_birthday_reminds
+                    ]
+                )
+            )
+        )
 
-class CompletedBirthdayRemindReaderImpl(Repo, CompletedBirthdayRemindReader):
     @exception_mapper
-    async def get_by_birthday_remind_id_and_year_and_type(
-        self,
-        birthday_remind_id: UUID,
-        year: int,
-        type: ReminderType,
-    ) -> CompletedBirthdayRemind:
-        birthday_remind = await self._session.scalar(
-            select(CompletedBirthdayRemindModel).filter(
-                CompletedBirthdayRemindModel.birthday_remind_id
-                == birthday_remind_id,
+    async def prepare_years(self, years: list[int]) -> None:
+        # Every year is stored in its own partition, which is created once
+        for year in years:
+            await self._session.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {get_partition_name(year)} "
+                    f"PARTITION OF {CompletedBirthdayRemindModel.__tablename__} "
+                    f"FOR VALUES FROM ({year:d}) TO ({year + 1:d})"
+                )
+            )
+
+    @exception_mapper
+    async def archive(
+        self, year: int, after_id: UUID | None, limit: int
+    ) -> UUID | None:
+        # The batch is a range scan of the partition's primary key after the previous batch,
+        # so dead rows of moved batches aren't scanned again.
+        # Rows locked by another instance are skipped, it moves them itself.
+        batch = (
+            select(CompletedBirthdayRemindModel.id)
+            .where(CompletedBirthdayRemindModel.year == year)
+            .order_by(CompletedBirthdayRemindModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after_id is not None:
+            batch = batch.where(CompletedBirthdayRemindModel.id > after_id)
+
+        moved = (
+            delete(CompletedBirthdayRemindModel)
+            .where(
                 CompletedBirthdayRemindModel.year == year,
-                CompletedBirthdayRemindModel.reminder_type == type,
+                CompletedBirthdayRemindModel.id.in_(batch),
+            )
+            .returning(
+                *(
+                    getattr(CompletedBirthdayRemindModel, column)
+                    for column in ARCHIVED_COLUMNS
+                )
             )
+            .cte("moved")
+        )
+        archived = (
+            insert(CompletedBirthdayRemindArchiveModel)
+            .from_select(ARCHIVED_COLUMNS, select(moved))
+            .on_conflict_do_nothing()
+            .cte("archived")
+        )
+
+        # Rows are deleted and inserted into the archive by one statement
+        return await self._session.scalar(
+            select(moved.c.id)
+            .order_by(moved.c.id.desc())
+            .limit(1)
+            .add_cte(archived)
+        )
+
+    @exception_mapper
+    async def drop_year(self, year: int) -> bool:
+        if await self._session.scalar(
+            select(exists().where(CompletedBirthdayRemindModel.year == year))
+        ):
+            return False
+
+        # Dropping the partition is instant and leaves no dead rows, unlike deleting them
+        await self._session.execute(
+            text(f"DROP TABLE IF EXISTS {get_partition_name(year)}")
         )
 
-        if birthday_remind is None:
-            raise IDForYearAndTypeNotFound(birthday_remind_id, year, type)
+        return True
 
-        return model_to_completed_birthday_remind(birthday_remind)
+
+class CompletedBirthdayRemindReaderImpl(Repo, CompletedBirthdayRemindReader):
+    @exception_mapper
+    async def get_stored_years(self) -> list[int]:
+        # Every stored year has its own partition
+        names = await self._session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": CompletedBirthdayRemindModel.__tablename__},
+        )
+
+        return sorted(
+            int(name.removeprefix(PARTITION_PREFIX))
+            for name in names
+            if name.startswith(PARTITION_PREFIX)
+        )
@@ -0,0 +1,236 @@
+from collections import defaultdict
+from uuid import UUID
+
+from sqlalchemy import (
+    ColumnElement,
+    cast,
+    delete,
+    func,
+    literal,
+    select,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindReader,
+    CompletedBirthdayRemindRepo,
+)
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    CompletedBirthdayRemind,
+    ReminderType,
+)
+
+from ..exception_mapper import exception_mapper
+from ..models import (
+    CompletedBirthdayRemindArchive as CompletedBirthdayRemindArchiveModel,
+)
+from ..models import (
+    CompletedBirthdayRemindFlags as CompletedBirthdayRemindFlagsModel,
+)
+from .base import Repo
+from .completed_birthday_remind import ARCHIVED_COLUMNS
+
+REMINDER_TYPE_BITS = {
+    ReminderType.BeforehandInOneDay: 1,
+    ReminderType.OnTheDay: 2,
+}
+
+
+def group_by_type(
+    completed_birthday_reminds: list[CompletedBirthdayRemind],
+) -> dict[ReminderType, list[CompletedBirthdayRemind]]:
+    # A statement can't update a row twice, so every type is written by its own statement
+    groups = defaultdict(list)
+    for completed_birthday_remind in completed_birthday_reminds:
+        groups[completed_birthday_remind.reminder_type].append(
+            completed_birthday_remind
+        )
+
+    return groups
+
+
+def has_bit(bit: int) -> ColumnElement[bool]:
+    return CompletedBirthdayRemindFlagsModel.flags.op("&")(bit) != 0
+
+
+class CompletedBirthdayRemindFlagsRepoImpl(Repo, CompletedBirthdayRemindRepo):
+    @exception_mapper
+    async def claim_many(
+        self, completed_birthday_reminds: list[CompletedBirthdayRemind]
+    ) -> list[CompletedBirthdayRemind]:
+        claimed = []
+        for type, group in group_by_type(completed_birthday_reminds).items():
+            bit = REMINDER_TYPE_BITS[type]
+            stmt = insert(CompletedBirthdayRemindFlagsModel).values(
+                [
+                    {
+                        "birthday_remind_id": completed_birthday_remind.birthday_remind_id,
+                        "year": completed_birthday_remind.year,
+                        "flags": bit,
+                    }
+                    for completed_birthday_remind in group
+                ]
+            )
+            # Rows whose bit is already set aren't updated, so they aren't returned
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[
+                    CompletedBirthdayRemindFlagsModel.birthday_remind_id,
+                    CompletedBirthdayRemindFlagsModel.year,
+                ],
+                set_={
+                    "flags": CompletedBirthdayRemindFlagsModel.flags.op("|")(
+                        stmt.excluded.flags
+                    )
+                },
+                where=~has_bit(bit),
+            ).returning(
+                CompletedBirthdayRemindFlagsModel.birthday_remind_id,
+                CompletedBirthdayRemindFlagsModel.year,
+            )
+
+            keys = set((await self._session.execute(stmt)).tuples())
+            claimed.extend(
+                completed_birthday_remind
+                for completed_birthday_remind in group
+                if (
+                    completed_birthday_remind.birthday_remind_id,
+                    completed_birthday_remind.year,
+                )
+                in keys
+            )
+
+        return claimed
+
+    @exception_mapper
+    async def delete_many(
+        self, completed_birthday_reminds: list[CompletedBirthdayRemind]
+    ) -> None:
+        for type, group in group_by_type(completed_birthday_reminds).items():
+            await self._session.execute(
+                update(CompletedBirthdayRemindFlagsModel)
+                .where(
+                    tuple_(
+                        CompletedBirthdayRemindFlagsModel.birthday_remind_id,
+                        CompletedBirthdayRemindFlagsModel.year,
+                    ).in_(
+                        [
+                            (
+                                completed_birthday_remind.birthday_remind_id,
+                                completed_birthday_remind.year,
+                            )
+                            for completed_birthday_remind in group
+                        ]
+                    )
+                )
+                .values(
+                    flags=CompletedBirthdayRemindFlagsModel.flags.op("&")(
+                        ~REMINDER_TYPE_BITS[type]
+                    )
+                )
+            )
+
+    @exception_mapper
+    async def prepare_years(self, years: list[int]) -> None:
+        # All years are stored in one table
+        return
+
+    @exception_mapper
+    async def archive(
+        self, year: int, after_id: UUID | None, limit: int
+    ) -> UUID | None:
+        batch = (
+            select(CompletedBirthdayRemindFlagsModel.birthday_remind_id)
+            .where(CompletedBirthdayRemindFlagsModel.year == year)
+            .order_by(CompletedBirthdayRemindFlagsModel.birthday_remind_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after_id is not None:
+            batch = batch.where(
+                CompletedBirthdayRemindFlagsModel.birthday_remind_id > after_id
+            )
+
+        moved = (
+            delete(CompletedBirthdayRemindFlagsModel)
+            .where(
+                CompletedBirthdayRemindFlagsModel.year == year,
+                CompletedBirthdayRemindFlagsModel.birthday_remind_id.in_(
+                    batch
+                ),
+            )
+            .returning(
+                CompletedBirthdayRemindFlagsModel.birthday_remind_id,
+                CompletedBirthdayRemindFlagsModel.year,
+                CompletedBirthdayRemindFlagsModel.flags,
+            )
+            .cte("moved")
+        )
+        # Every set bit becomes a row of the archive
+        reminder_type = CompletedBirthdayRemindArchiveModel.reminder_type.type
+        archived = (
+            insert(CompletedBirthdayRemindArchiveModel)
+            .from_select(
+                ARCHIVED_COLUMNS,
+                union_all(
+                    *(
+                        select(
+                            func.uuid_generate_v7(),
+                            moved.c.birthday_remind_id,
+                            moved.c.year,
+                            # Unions don't infer the enum type of a parameter, so it's cast explicitly
+                            cast(
+                                literal(type, reminder_type),
+                                reminder_type,
+                            ),
+                            func.now(),
+                            func.now(),
+                        ).where(moved.c.flags.op("&")(bit) != 0)
+                        for type, bit in REMINDER_TYPE_BITS.items()
+                    )
+                ),
+            )
+            .on_conflict_do_nothing()
+            .cte("archived")
+        )
+
+        return await self._session.scalar(
+            select(moved.c.birthday_remind_id)
+            .order_by(moved.c.birthday_remind_id.desc())
+            .limit(1)
+            .add_cte(archived)
+        )
+
+    @exception_mapper
+    async def drop_year(self, year: int) -> bool:
+        # Rows are deleted by the archiving, so the year is dropped when no rows are left
+        return not await self._session.scalar(
+            select(
+                select(CompletedBirthdayRemindFlagsModel.year)
+                .where(CompletedBirthdayRemindFlagsModel.year == year)
+                .exists()
+            )
+        )
+
+
+class CompletedBirthdayRemindFlagsReaderImpl(
+    Repo, CompletedBirthdayRemindReader
+):
+    @exception_mapper
+    async def get_stored_years(self) -> list[int]:
+        # The bounds are read from the `year` index, and years between them are cheap to check
+        min_year, max_year = (
+            await self._session.execute(
+                select(
+                    func.min(CompletedBirthdayRemindFlagsModel.year),
+                    func.max(CompletedBirthdayRemindFlagsModel.year),
+                )
+            )
+        ).one()
+
+        if min_year is None:
+            return []
+
+        return list(range(min_year, max_year + 1))
@@ -0,0 +1,179 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import aliased
+
+from birthday_reminder.adapters.database.converters import (
+    models_to_delivery_with_remind,
+)
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryRetry,
+    DeliveryWithRemind,
+)
+
+from ..exception_mapper import exception_mapper
+from ..models import BirthdayRemind as BirthdayRemindModel
+from ..models import Delivery as DeliveryModel
+from ..models import User as UserModel
+from .base import Repo
+
+
+class DeliveryRepoImpl(Repo, DeliveryRepo):
+    @exception_mapper
+    async def add_many(self, deliveries: list[Delivery]) -> int:
+        if not deliveries:
+            return 0
+
+        # One multi-row INSERT for the whole batch.
+        # Deliveries that are already in the outbox (e.g. added by a replay) are skipped.
+        result = await self._session.scalars(
+            insert(DeliveryModel)
+            .values(
+                [
+                    {
+                        "id": delivery.id,
+                        "birthday_remind_id": delivery.birthday_remind_id,
+                        "year": delivery.year,
+                        "reminder_type": delivery.reminder_type,
+                        "locked_until": delivery.not_before,
+                    }
+                    for delivery in deliveries
+                ]
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    DeliveryModel.birthday_remind_id,
+                    DeliveryModel.year,
+                    DeliveryModel.reminder_type,
+                ]
+            )
+            .returning(DeliveryModel.id)
+        )
+
+        return len(result.all())
+
+    @exception_mapper
+    async def claim(
+        self, batch_size: int, lease: timedelta
+    ) -> list[DeliveryWithRemind]:
+        # Rows locked by other consumers are skipped instead of waiting for them,
+        # so any number of consumers claim different batches at once.
+        pending = (
+            select(DeliveryModel.id)
+            .where(
+                DeliveryModel.done_at.is_(None),
+                or_(
+                    DeliveryModel.locked_until.is_(None),
+                    DeliveryModel.locked_until < func.now(),
+                ),
+            )
+            .order_by(DeliveryModel.id)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = (
+            update(DeliveryModel)
+            .where(DeliveryModel.id.in_(pending))
+            .values(locked_until=func.now() + lease)
+            .returning(DeliveryModel)
+            .cte("claimed")
+        )
+        claimed_delivery = aliased(DeliveryModel, claimed)
+
+        # Reminders and users are joined in the same statement to avoid separate queries for them
+        result = await self._session.execute(
+            select(claimed_delivery, BirthdayRemindModel, UserModel)
+            .join(
+                BirthdayRemindModel,
+                BirthdayRemindModel.id == claimed_delivery.birthday_remind_id,
+            )
+            .join(UserModel, UserModel.id == BirthdayRemindModel.user_id)
+            .order_by(claimed_delivery.id)
+        )
+
+        return [
+            models_to_delivery_with_remind(delivery, birthday_remind, user)
+            for delivery, birthday_remind, user in result
+        ]
+
+    @exception_mapper
+    async def mark_done(self, ids: list[UUID]) -> None:
+        if not ids:
+            return
+
+        await self._session.execute(
+            update(DeliveryModel)
+            .where(DeliveryModel.id.in_(ids))
+            .values(done_at=func.now(), locked_until=None)
+        )
+
+    @exception_mapper
+    async def release(self, ids: list[UUID]) -> None:
+        if not ids:
+            return
+
+        await self._session.execute(
+            update(DeliveryModel)
+            .where(
+                DeliveryModel.id.in_(ids),
+                DeliveryModel.done_at.is_(None),
+            )
+            .values(locked_until=None)
+        )
+
+    @exception_mapper
+    async def reschedule(self, retries: list[DeliveryRetry]) -> None:
+        if not retries:
+            return
+
+        now = datetime.now(tz=timezone.utc)
+
+        # Bulk UPDATE by the primary key, executed as one `executemany`
+        await self._session.execute(
+            update(DeliveryModel),
+            [
+                {
+                    "id": retry.id,
+                    "attempts": retry.attempts,
+                    "last_error": retry.last_error,
+                    "locked_until": retry.retry_at,
+                    "done_at": None if retry.retry_at else now,
+                    "failed_at": None if retry.retry_at else now,
+                }
+                for retry in retries
+            ],
+        )
+
+    @exception_mapper
+    async def delete_done(
+        self, before_year: int, after_id: UUID | None, limit: int
+    ) -> UUID | None:
+        # The batch is a range scan of the primary key after the previous batch,
+        # so dead rows of deleted batches aren't scanned again.
+        batch = (
+            select(DeliveryModel.id)
+            .where(
+                DeliveryModel.year < before_year,
+                DeliveryModel.done_at.is_not(None),
+            )
+            .order_by(DeliveryModel.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if after_id is not None:
+            batch = batch.where(DeliveryModel.id > after_id)
+
+        deleted = (
+            delete(DeliveryModel)
+            .where(DeliveryModel.id.in_(batch))
+            .returning(DeliveryModel.id)
+            .cte("deleted")
+        )
+
+        return await self._session.scalar(
+            select(deleted.c.id).order_by(deleted.c.id.desc()).limit(1)
+        )
@@ -0,0 +1,58 @@
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from birthday_reminder.adapters.database.converters import (
+    model_to_scheduler_checkpoint,
+)
+from birthday_reminder.application.scheduler_checkpoint import (
+    SchedulerCheckpointReader,
+    SchedulerCheckpointRepo,
+)
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
+from birthday_reminder.domain.scheduler_checkpoint.exceptions import (
+    NameNotFound,
+)
+
+from ..exception_mapper import exception_mapper
+from ..models import SchedulerCheckpoint as SchedulerCheckpointModel
+from .base import Repo
+
+
+class SchedulerCheckpointRepoImpl(Repo, SchedulerCheckpointRepo):
+    @exception_mapper
+    async def save(self, checkpoint: SchedulerCheckpoint) -> None:
+        stmt = insert(SchedulerCheckpointModel).values(
+            name=checkpoint.name,
+            processed_at=checkpoint.processed_at,
+        )
+
+        # The checkpoint only moves forward, even if an older one is saved later
+        await self._session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[SchedulerCheckpointModel.name],
+                set_={
+                    SchedulerCheckpointModel.processed_at: func.greatest(
+                        SchedulerCheckpointModel.processed_at,
+                        stmt.excluded.processed_at,
+                    ),
+                    SchedulerCheckpointModel.updated_at: func.now(),
+                },
+            )
+        )
+
+
+class SchedulerCheckpointReaderImpl(Repo, SchedulerCheckpointReader):
+    @exception_mapper
+    async def get_by_name(self, name: str) -> SchedulerCheckpoint:
+        checkpoint = await self._session.scalar(
+            select(SchedulerCheckpointModel).filter(
+                SchedulerCheckpointModel.name == name
+            )
+        )
+
+        if checkpoint is None:
+            raise NameNotFound(name)
+
+        return model_to_scheduler_checkpoint(checkpoint)
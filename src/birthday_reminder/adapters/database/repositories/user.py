@@ -69,3 +69,13 @@ class UserReaderImpl(Repo, UserReader):
         )
 
         return UsersStats(*result.one())
+
+    @exception_mapper
+    async def get_timezones(self) -> list[str]:
+        result = await self._session.scalars(
+            select(UserModel.timezone)
+            .distinct()
+            .filter(UserModel.timezone.is_not(None))
+        )
+
+        return list(result.all())
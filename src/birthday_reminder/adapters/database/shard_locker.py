@@ -0,0 +1,76 @@
+import asyncio
+from logging import getLogger
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from birthday_reminder.application.scheduler.shard_locker import ShardLocker
+
+from .exception_mapper import exception_mapper
+
+logger = getLogger(__name__)
+
+# The first key of advisory locks, so shard locks don't collide with other advisory locks
+LOCK_NAMESPACE = "birthday_reminder:shard"
+
+
+class ShardLockerImpl(ShardLocker):
+    """
+    Shards are locked by Postgres session-level advisory locks on a dedicated connection.
+    Locks are released by Postgres when the connection is closed, e.g. when the instance dies.
+    """
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        self._connection: AsyncConnection | None = None
+        # Statements on one connection can't run concurrently
+        self._lock = asyncio.Lock()
+
+    async def _scalar(self, stmt) -> bool:
+        async with self._lock:
+            if self._connection is None:
+                connection = await self._engine.connect()
+                # Session-level locks don't need a transaction, so the connection isn't left idle in one
+                self._connection = await connection.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                )
+
+            try:
+                return bool(await self._connection.scalar(stmt))
+            except SQLAlchemyError:
+                # Locks of a broken connection are lost, so it's replaced on the next call
+                await self._close()
+
+                raise
+
+    async def _close(self) -> None:
+        if self._connection is None:
+            return
+
+        connection, self._connection = self._connection, None
+
+        try:
+            await connection.close()
+        except SQLAlchemyError as err:
+            logger.warn("Error while closing the connection", exc_info=err)
+
+    @exception_mapper
+    async def try_lock(self, shard: int) -> bool:
+        return await self._scalar(
+            select(
+                func.pg_try_advisory_lock(func.hashtext(LOCK_NAMESPACE), shard)
+            )
+        )
+
+    @exception_mapper
+    async def unlock(self, shard: int) -> None:
+        await self._scalar(
+            select(
+                func.pg_advisory_unlock(func.hashtext(LOCK_NAMESPACE), shard)
+            )
+        )
+
+    async def close(self) -> None:
+        async with self._lock:
+            await self._close()
@@ -1,4 +1,10 @@
-__all__ = ["AddBirthdayRemind", "DeleteBirthdayRemindById"]
+__all__ = [
+    "AddBirthdayRemind",
+    "AddBirthdayRemindRequest",
+    "DeleteBirthdayRemindById",
+    "RollNextOccurrences",
+]
 
-from .add import AddBirthdayRemind
+from .add import AddBirthdayRemind, AddBirthdayRemindRequest
 from .delete_by_id import DeleteBirthdayRemindById
+from .roll_next_occurrences import RollNextOccurrences
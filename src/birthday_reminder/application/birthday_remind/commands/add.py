@@ -1,9 +1,22 @@
+from dataclasses import dataclass, replace
+from datetime import date
+
 from birthday_reminder.application.birthday_remind import BirthdayRemindRepo
 from birthday_reminder.application.common import Interactor, UnitOfWork
 from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
+from birthday_reminder.domain.birthday_remind.services import (
+    get_next_occurrence,
+)
+
+
+@dataclass
+class AddBirthdayRemindRequest:
+    birthday_remind: BirthdayRemind
+    # Current date in the reminder timezone, the same one the nightly roll uses
+    today: date
 
 
-class AddBirthdayRemind(Interactor[BirthdayRemind, None]):
+class AddBirthdayRemind(Interactor[AddBirthdayRemindRequest, None]):
     def __init__(
         self,
         birthday_remind_repo: BirthdayRemindRepo,
@@ -12,6 +25,16 @@ class AddBirthdayRemind(Interactor[BirthdayRemind, None]):
         self.birthday_remind_repo = birthday_remind_repo
         self.uow = uow
 
-    async def __call__(self, birthday_remind: BirthdayRemind) -> None:
+    async def __call__(self, dto: AddBirthdayRemindRequest) -> None:
+        birthday_remind = dto.birthday_remind
+
+        if birthday_remind.next_occurrence is None:
+            birthday_remind = replace(
+                birthday_remind,
+                next_occurrence=get_next_occurrence(
+                    birthday_remind.day, birthday_remind.month, dto.today
+                ),
+            )
+
         await self.birthday_remind_repo.add(birthday_remind)
         await self.uow.commit()
@@ -0,0 +1,20 @@
+from datetime import date
+
+from birthday_reminder.application.birthday_remind import BirthdayRemindRepo
+from birthday_reminder.application.common import Interactor, UnitOfWork
+
+
+class RollNextOccurrences(Interactor[date, int]):
+    def __init__(
+        self,
+        birthday_remind_repo: BirthdayRemindRepo,
+        uow: UnitOfWork,
+    ):
+        self.birthday_remind_repo = birthday_remind_repo
+        self.uow = uow
+
+    async def __call__(self, today: date) -> int:
+        count = await self.birthday_remind_repo.roll_next_occurrences(today)
+        await self.uow.commit()
+
+        return count
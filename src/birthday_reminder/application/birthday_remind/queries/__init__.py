@@ -4,15 +4,15 @@ __all__ = [
     "GetByUserIDAndSortByNearest",
     "GetByUserIDAndSortByNearestRequest",
     "GetBirthdayRemindersStats",
-    "GetByInterval",
-    "GetByIntervalRequest",
+    "StreamBySlot",
+    "StreamBySlotRequest",
 ]
 
 from .get_birthday_reminders_stats import GetBirthdayRemindersStats
 from .get_by_id import GetByID
-from .get_by_interval import GetByInterval, GetByIntervalRequest
 from .get_by_user_id import GetByUserID
 from .get_by_user_id_and_sort_by_nearest import (
     GetByUserIDAndSortByNearest,
     GetByUserIDAndSortByNearestRequest,
 )
+from .stream_by_slot import StreamBySlot, StreamBySlotRequest
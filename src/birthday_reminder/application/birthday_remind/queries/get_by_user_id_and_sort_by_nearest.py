@@ -9,8 +9,6 @@ from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
 @dataclass
 class GetByUserIDAndSortByNearestRequest:
     user_id: UUID
-    now_day: int
-    now_month: int
 
 
 class GetByUserIDAndSortByNearest(
@@ -28,5 +26,5 @@ class GetByUserIDAndSortByNearest(
         self, dto: GetByUserIDAndSortByNearestRequest
     ) -> list[BirthdayRemind]:
         return await self.birthday_reader.get_by_user_id_and_sort_by_nearest(
-            dto.user_id, dto.now_day, dto.now_month
+            dto.user_id
         )
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from birthday_reminder.application.birthday_remind import BirthdayRemindReader
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.domain.birthday_remind.entities import (
+    BirthdayRemindWithUser,
+)
+
+
+@dataclass
+class StreamBySlotRequest:
+    timezones: list[str]
+    include_unset_timezone: bool
+    hours: list[int]
+    include_unset_hour: bool
+    start_day: int
+    start_month: int
+    end_day: int
+    end_month: int
+    shard: int
+    shard_count: int
+    batch_size: int
+
+
+class StreamBySlot(
+    Interactor[
+        StreamBySlotRequest, AsyncIterator[list[BirthdayRemindWithUser]]
+    ]
+):
+    def __init__(
+        self,
+        birthday_reader: BirthdayRemindReader,
+        uow: UnitOfWork,
+    ):
+        self.birthday_reader = birthday_reader
+        self.uow = uow
+
+    async def __call__(
+        self, dto: StreamBySlotRequest
+    ) -> AsyncIterator[list[BirthdayRemindWithUser]]:
+        async for batch in self.birthday_reader.stream_by_slot(
+            dto.timezones,
+            dto.include_unset_timezone,
+            dto.hours,
+            dto.include_unset_hour,
+            dto.start_day,
+            dto.start_month,
+            dto.end_day,
+            dto.end_month,
+            dto.shard,
+            dto.shard_count,
+            dto.batch_size,
+        ):
+            yield batch
@@ -1,10 +1,11 @@
 from abc import abstractmethod
-from typing import Protocol
+from typing import AsyncIterator, Protocol
 from uuid import UUID
 
 from birthday_reminder.domain.birthday_remind.entities import (
     BirthdayRemind,
     BirthdayRemindersStats,
+    BirthdayRemindWithUser,
 )
 
 
@@ -19,7 +20,7 @@ class Reader(Protocol):
 
     @abstractmethod
     async def get_by_user_id_and_sort_by_nearest(
-        self, user_id: UUID, now_day: int, now_month: int
+        self, user_id: UUID
     ) -> list[BirthdayRemind]:
         raise NotImplementedError
 
@@ -28,11 +29,18 @@ class Reader(Protocol):
         raise NotImplementedError
 
     @abstractmethod
-    async def get_by_interval(
+    def stream_by_slot(
         self,
+        timezones: list[str],
+        include_unset_timezone: bool,
+        hours: list[int],
+        include_unset_hour: bool,
         start_day: int,
         start_month: int,
         end_day: int,
         end_month: int,
-    ) -> list[BirthdayRemind]:
+        shard: int,
+        shard_count: int,
+        batch_size: int,
+    ) -> AsyncIterator[list[BirthdayRemindWithUser]]:
         raise NotImplementedError
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from datetime import date
 from typing import Protocol
 from uuid import UUID
 
@@ -13,3 +14,12 @@ class Repo(Protocol):
     @abstractmethod
     async def delete_by_id(self, id: UUID) -> None:
         raise NotImplementedError
+
+    @abstractmethod
+    async def roll_next_occurrences(self, today: date) -> int:
+        """
+        Move the next occurrences of passed birthdays to the nearest ones on `today` or after it.
+
+        :return: The number of updated reminders.
+        """
+        raise NotImplementedError
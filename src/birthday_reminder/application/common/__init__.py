@@ -1,4 +1,5 @@
-__all__ = ["Interactor", "UnitOfWork"]
+__all__ = ["Interactor", "UnitOfWork", "WriteBuffer"]
 
 from .interactor import Interactor
 from .uow import UnitOfWork
+from .write_buffer import WriteBuffer
@@ -0,0 +1,97 @@
+import asyncio
+from logging import getLogger
+from typing import Awaitable, Callable, Generic, TypeVar
+
+Item = TypeVar("Item")
+
+logger = getLogger(__name__)
+
+# Items of failed writes are kept for the next flush up to this number of full buffers
+MAX_PENDING_BUFFERS = 100
+
+
+class WriteBuffer(Generic[Item]):
+    """
+    A write-behind buffer.
+    Items are collected in memory and written by one `write` call every `max_size` items or every `flush_interval` seconds,
+    whichever comes first, so the latency of the write isn't a part of the latency of the caller.
+    Items of a failed write are kept for the next flush, but not more than `max_pending` items in total,
+    so a long outage of the storage doesn't grow memory without limit.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[list[Item]], Awaitable[None]],
+        max_size: int,
+        flush_interval: float,
+        max_pending: int | None = None,
+    ) -> None:
+        self._write = write
+        self._max_size = max_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending or max_size * MAX_PENDING_BUFFERS
+
+        self._items: list[Item] = []
+        self._is_full = asyncio.Event()
+        self._lock = asyncio.Lock()
+
+    def add(self, item: Item) -> None:
+        self._items.append(item)
+
+        if len(self._items) >= self._max_size:
+            self._is_full.set()
+
+    async def flush(self) -> None:
+        async with self._lock:
+            items, self._items = self._items, []
+
+            if not items:
+                return
+
+            try:
+                await self._write(items)
+            except Exception as err:
+                logger.error(
+                    "Error while flushing the write buffer. Items will be written on the next flush",
+                    extra={"items_count": len(items)},
+                    exc_info=err,
+                )
+
+                self._items[:0] = items
+
+                dropped_count = len(self._items) - self._max_pending
+                if dropped_count > 0:
+                    # The oldest items are dropped, their deliveries are claimed again when their lease expires
+                    logger.error(
+                        "Write buffer is full, dropping the oldest items",
+                        extra={"items_count": dropped_count},
+                    )
+
+                    del self._items[:dropped_count]
+
+                return
+
+            logger.debug(
+                "Write buffer flushed", extra={"items_count": len(items)}
+            )
+
+    async def run(self) -> None:
+        """
+        Flush the buffer periodically or when it is full.
+        The buffer is force-flushed when the task is cancelled.
+        """
+
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(
+                        self._is_full.wait(), self._flush_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+
+                self._is_full.clear()
+
+                await self.flush()
+        finally:
+            await self.flush()
@@ -1,3 +1,10 @@
-__all__ = ["AddCompletedBirthdayRemind"]
+__all__ = [
+    "ArchiveCompletedBirthdayReminds",
+    "ArchiveRequest",
+    "DropYear",
+    "PrepareYears",
+]
 
-from .add import AddCompletedBirthdayRemind
+from .archive import ArchiveCompletedBirthdayReminds, ArchiveRequest
+from .drop_year import DropYear
+from .prepare_years import PrepareYears
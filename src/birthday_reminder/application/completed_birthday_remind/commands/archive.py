@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindRepo,
+)
+
+
+@dataclass
+class ArchiveRequest:
+    year: int
+    after_id: UUID | None
+    limit: int
+
+
+class ArchiveCompletedBirthdayReminds(Interactor[ArchiveRequest, UUID | None]):
+    """
+    Move one batch of completed reminders of the year to the archive.
+    Batches are committed separately, so every transaction holds few locks and writes little WAL.
+    """
+
+    def __init__(
+        self,
+        completed_birthday_remind_repo: CompletedBirthdayRemindRepo,
+        uow: UnitOfWork,
+    ):
+        self.completed_birthday_remind_repo = completed_birthday_remind_repo
+        self.uow = uow
+
+    async def __call__(self, dto: ArchiveRequest) -> UUID | None:
+        last_id = await self.completed_birthday_remind_repo.archive(
+            dto.year, dto.after_id, dto.limit
+        )
+        await self.uow.commit()
+
+        return last_id
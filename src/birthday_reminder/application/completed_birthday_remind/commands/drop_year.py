@@ -2,12 +2,9 @@ from birthday_reminder.application.common import Interactor, UnitOfWork
 from birthday_reminder.application.completed_birthday_remind import (
     CompletedBirthdayRemindRepo,
 )
-from birthday_reminder.domain.completed_birthday_remind.entities import (
-    CompletedBirthdayRemind,
-)
 
 
-class AddCompletedBirthdayRemind(Interactor[CompletedBirthdayRemind, None]):
+class DropYear(Interactor[int, bool]):
     def __init__(
         self,
         completed_birthday_remind_repo: CompletedBirthdayRemindRepo,
@@ -16,10 +13,8 @@ class AddCompletedBirthdayRemind(Interactor[CompletedBirthdayRemind, None]):
         self.completed_birthday_remind_repo = completed_birthday_remind_repo
         self.uow = uow
 
-    async def __call__(
-        self, completed_birthday_remind: CompletedBirthdayRemind
-    ) -> None:
-        await self.completed_birthday_remind_repo.add(
-            completed_birthday_remind
-        )
+    async def __call__(self, year: int) -> bool:
+        dropped = await self.completed_birthday_remind_repo.drop_year(year)
         await self.uow.commit()
+
+        return dropped
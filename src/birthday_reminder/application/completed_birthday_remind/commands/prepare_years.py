@@ -0,0 +1,18 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindRepo,
+)
+
+
+class PrepareYears(Interactor[list[int], None]):
+    def __init__(
+        self,
+        completed_birthday_remind_repo: CompletedBirthdayRemindRepo,
+        uow: UnitOfWork,
+    ):
+        self.completed_birthday_remind_repo = completed_birthday_remind_repo
+        self.uow = uow
+
+    async def __call__(self, years: list[int]) -> None:
+        await self.completed_birthday_remind_repo.prepare_years(years)
+        await self.uow.commit()
@@ -1,5 +1,3 @@
-__all__ = [
-    "GetByBirthdayRemindIDAndYear",
-]
+__all__ = ["GetStoredYears"]
 
-from .get_by_birthday_remind_id_and_year import GetByBirthdayRemindIDAndYear
+from .get_stored_years import GetStoredYears
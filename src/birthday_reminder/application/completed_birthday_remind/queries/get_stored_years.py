@@ -0,0 +1,17 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindReader,
+)
+
+
+class GetStoredYears(Interactor[None, list[int]]):
+    def __init__(
+        self,
+        completed_birthday_reader: CompletedBirthdayRemindReader,
+        uow: UnitOfWork,
+    ):
+        self.completed_birthday_reader = completed_birthday_reader
+        self.uow = uow
+
+    async def __call__(self) -> list[int]:
+        return await self.completed_birthday_reader.get_stored_years()
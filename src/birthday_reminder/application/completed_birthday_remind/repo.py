@@ -1,5 +1,6 @@
 from abc import abstractmethod
 from typing import Protocol
+from uuid import UUID
 
 from birthday_reminder.domain.completed_birthday_remind.entities import (
     CompletedBirthdayRemind,
@@ -8,7 +9,53 @@ from birthday_reminder.domain.completed_birthday_remind.entities import (
 
 class Repo(Protocol):
     @abstractmethod
-    async def add(
-        self, completed_birthday_remind: CompletedBirthdayRemind
+    async def claim_many(
+        self, completed_birthday_reminds: list[CompletedBirthdayRemind]
+    ) -> list[CompletedBirthdayRemind]:
+        """
+        Add completed reminders whose reminder, year and type aren't added yet.
+
+        :return: The added completed reminders.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(
+        self, completed_birthday_reminds: list[CompletedBirthdayRemind]
     ) -> None:
+        """
+        Delete completed reminders by their reminder, year and type.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def prepare_years(self, years: list[int]) -> None:
+        """
+        Prepare the storage, so completed reminders of the years can be added.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def archive(
+        self, year: int, after_id: UUID | None, limit: int
+    ) -> UUID | None:
+        """
+        Move up to `limit` completed reminders of the year with IDs after `after_id` to the archive.
+
+        :return: The last moved ID or `None` if there are no more reminders to move.
+        """
+
+        raise NotImplementedError
+
+    @abstractmethod
+    async def drop_year(self, year: int) -> bool:
+        """
+        Drop the storage of the year if all its completed reminders are archived.
+
+        :return: Whether the storage is dropped.
+        """
+
         raise NotImplementedError
@@ -0,0 +1,3 @@
+__all__ = ["DeliveryRepo"]
+
+from .repo import Repo as DeliveryRepo
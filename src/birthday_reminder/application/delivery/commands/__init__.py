@@ -0,0 +1,21 @@
+__all__ = [
+    "AddDeliveries",
+    "ClaimCompletions",
+    "ClaimDeliveries",
+    "ClaimDeliveriesRequest",
+    "CompleteDeliveries",
+    "PruneDeliveries",
+    "PruneDeliveriesRequest",
+    "ReleaseDeliveries",
+    "RetryDeliveries",
+    "RetryDeliveriesRequest",
+    "RetryPolicy",
+]
+
+from .add_many import AddDeliveries
+from .claim import ClaimDeliveries, ClaimDeliveriesRequest
+from .claim_completions import ClaimCompletions
+from .complete import CompleteDeliveries
+from .prune import PruneDeliveries, PruneDeliveriesRequest
+from .release import ReleaseDeliveries
+from .retry import RetryDeliveries, RetryDeliveriesRequest, RetryPolicy
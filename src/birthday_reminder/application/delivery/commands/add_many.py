@@ -0,0 +1,24 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.delivery.entities import Delivery
+
+
+class AddDeliveries(Interactor[list[Delivery], int]):
+    """
+    Add deliveries to the outbox and return the number of added ones.
+    Deliveries that are already in the outbox are skipped.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.uow = uow
+
+    async def __call__(self, deliveries: list[Delivery]) -> int:
+        added_count = await self.delivery_repo.add_many(deliveries)
+        await self.uow.commit()
+
+        return added_count
@@ -0,0 +1,64 @@
+from dataclasses import dataclass
+from datetime import timedelta
+from uuid import UUID
+
+from uuid6 import uuid7
+
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    CompletedBirthdayRemind,
+    ReminderType,
+)
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryWithRemind,
+)
+
+
+def get_completed_birthday_remind(
+    delivery: Delivery,
+) -> CompletedBirthdayRemind:
+    return CompletedBirthdayRemind(
+        uuid7(),
+        delivery.birthday_remind_id,
+        delivery.year,
+        delivery.reminder_type,
+    )
+
+
+def get_key(
+    record: Delivery | CompletedBirthdayRemind,
+) -> tuple[UUID, int, ReminderType]:
+    return record.birthday_remind_id, record.year, record.reminder_type
+
+
+@dataclass
+class ClaimDeliveriesRequest:
+    batch_size: int
+    lease: timedelta
+
+
+class ClaimDeliveries(
+    Interactor[ClaimDeliveriesRequest, list[DeliveryWithRemind]]
+):
+    """
+    Claim pending deliveries for `lease`.
+    If claimed deliveries aren't marked as done before the lease expires, they can be claimed again.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.uow = uow
+
+    async def __call__(
+        self, dto: ClaimDeliveriesRequest
+    ) -> list[DeliveryWithRemind]:
+        deliveries = await self.delivery_repo.claim(dto.batch_size, dto.lease)
+        await self.uow.commit()
+
+        return deliveries
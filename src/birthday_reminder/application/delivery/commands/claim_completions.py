@@ -0,0 +1,53 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindRepo,
+)
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.delivery.entities import Delivery
+
+from .claim import get_completed_birthday_remind, get_key
+
+
+class ClaimCompletions(Interactor[list[Delivery], list[Delivery]]):
+    """
+    Record reminders of deliveries as completed right before they're sent.
+    Only deliveries whose record is added are returned, so a reminder is sent at most once for the year and type,
+    even if its delivery is claimed again after a crash. Deliveries whose reminders are already completed are marked as done.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        completed_birthday_remind_repo: CompletedBirthdayRemindRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.completed_birthday_remind_repo = completed_birthday_remind_repo
+        self.uow = uow
+
+    async def __call__(self, deliveries: list[Delivery]) -> list[Delivery]:
+        completed_birthday_reminds = (
+            await self.completed_birthday_remind_repo.claim_many(
+                [
+                    get_completed_birthday_remind(delivery)
+                    for delivery in deliveries
+                ]
+            )
+        )
+        claimed_keys = {
+            get_key(completed_birthday_remind)
+            for completed_birthday_remind in completed_birthday_reminds
+        }
+
+        to_send = []
+        completed_ids = []
+        for delivery in deliveries:
+            if get_key(delivery) in claimed_keys:
+                to_send.append(delivery)
+            else:
+                completed_ids.append(delivery.id)
+
+        await self.delivery_repo.mark_done(completed_ids)
+        await self.uow.commit()
+
+        return to_send
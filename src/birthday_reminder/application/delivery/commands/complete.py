@@ -0,0 +1,24 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.delivery.entities import Delivery
+
+
+class CompleteDeliveries(Interactor[list[Delivery], None]):
+    """
+    Mark sent deliveries as done.
+    Their reminders are already recorded as completed right before they were sent.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.uow = uow
+
+    async def __call__(self, deliveries: list[Delivery]) -> None:
+        await self.delivery_repo.mark_done(
+            [delivery.id for delivery in deliveries]
+        )
+        await self.uow.commit()
@@ -0,0 +1,35 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.delivery import DeliveryRepo
+
+
+@dataclass
+class PruneDeliveriesRequest:
+    before_year: int
+    after_id: UUID | None
+    limit: int
+
+
+class PruneDeliveries(Interactor[PruneDeliveriesRequest, UUID | None]):
+    """
+    Delete one batch of done deliveries of old years from the outbox.
+    Batches are committed separately, so every transaction holds few locks and writes little WAL.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.uow = uow
+
+    async def __call__(self, dto: PruneDeliveriesRequest) -> UUID | None:
+        last_id = await self.delivery_repo.delete_done(
+            dto.before_year, dto.after_id, dto.limit
+        )
+        await self.uow.commit()
+
+        return last_id
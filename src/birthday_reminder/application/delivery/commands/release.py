@@ -0,0 +1,37 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindRepo,
+)
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.delivery.entities import Delivery
+
+from .claim import get_completed_birthday_remind
+
+
+class ReleaseDeliveries(Interactor[list[Delivery], None]):
+    """
+    Release leases of claimed deliveries that weren't sent, so they can be claimed again at once.
+    Completion records added before sending are deleted, so the next claim succeeds.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        completed_birthday_remind_repo: CompletedBirthdayRemindRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.completed_birthday_remind_repo = completed_birthday_remind_repo
+        self.uow = uow
+
+    async def __call__(self, deliveries: list[Delivery]) -> None:
+        await self.delivery_repo.release(
+            [delivery.id for delivery in deliveries]
+        )
+        await self.completed_birthday_remind_repo.delete_many(
+            [
+                get_completed_birthday_remind(delivery)
+                for delivery in deliveries
+            ]
+        )
+        await self.uow.commit()
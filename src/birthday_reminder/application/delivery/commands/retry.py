@@ -0,0 +1,84 @@
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.completed_birthday_remind import (
+    CompletedBirthdayRemindRepo,
+)
+from birthday_reminder.application.delivery import DeliveryRepo
+from birthday_reminder.domain.delivery.entities import (
+    DeliveryFailure,
+    DeliveryRetry,
+)
+
+from .claim import get_completed_birthday_remind
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int
+    base_delay: timedelta
+    max_delay: timedelta
+
+    def get_delay(self, attempts: int) -> timedelta:
+        """
+        Get the delay before the next attempt after `attempts` failed ones.
+        The delay grows exponentially up to `max_delay`, and a random part of it is dropped,
+        so deliveries failed at once (e.g. during an outage of Telegram) aren't retried at once.
+        """
+
+        delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+
+        return delay * random.uniform(0.5, 1)
+
+
+@dataclass
+class RetryDeliveriesRequest:
+    failures: list[DeliveryFailure]
+    policy: RetryPolicy
+
+
+class RetryDeliveries(Interactor[RetryDeliveriesRequest, None]):
+    """
+    Schedule failed deliveries to be claimed again after a backoff, or give them up after the last attempt.
+    The failure reason is recorded in both cases.
+    Completion records added before sending are deleted, because the reminders aren't sent.
+    """
+
+    def __init__(
+        self,
+        delivery_repo: DeliveryRepo,
+        completed_birthday_remind_repo: CompletedBirthdayRemindRepo,
+        uow: UnitOfWork,
+    ):
+        self.delivery_repo = delivery_repo
+        self.completed_birthday_remind_repo = completed_birthday_remind_repo
+        self.uow = uow
+
+    async def __call__(self, dto: RetryDeliveriesRequest) -> None:
+        now = datetime.now(tz=timezone.utc)
+
+        retries = []
+        for failure in dto.failures:
+            attempts = failure.delivery.attempts + 1
+
+            retries.append(
+                DeliveryRetry(
+                    failure.delivery.id,
+                    attempts,
+                    failure.error,
+                    now + dto.policy.get_delay(attempts)
+                    if attempts < dto.policy.max_attempts
+                    else None,
+                )
+            )
+
+        await self.delivery_repo.reschedule(retries)
+        await self.completed_birthday_remind_repo.delete_many(
+            [
+                get_completed_birthday_remind(failure.delivery)
+                for failure in dto.failures
+            ]
+        )
+        await self.uow.commit()
@@ -0,0 +1,47 @@
+from abc import abstractmethod
+from datetime import timedelta
+from typing import Protocol
+from uuid import UUID
+
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryRetry,
+    DeliveryWithRemind,
+)
+
+
+class Repo(Protocol):
+    @abstractmethod
+    async def add_many(self, deliveries: list[Delivery]) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def claim(
+        self, batch_size: int, lease: timedelta
+    ) -> list[DeliveryWithRemind]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def mark_done(self, ids: list[UUID]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release(self, ids: list[UUID]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def reschedule(self, retries: list[DeliveryRetry]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_done(
+        self, before_year: int, after_id: UUID | None, limit: int
+    ) -> UUID | None:
+        """
+        Delete up to `limit` done deliveries of years before `before_year` with IDs after `after_id`.
+        Reminders of these years aren't produced anymore, so their deliveries aren't needed to skip duplicates.
+
+        :return: The last deleted ID or `None` if there are no more deliveries to delete.
+        """
+
+        raise NotImplementedError
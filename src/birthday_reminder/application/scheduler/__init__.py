@@ -1,5 +1,18 @@
-__all__ = ["nearest_birthday_reminders_producer"]
+__all__ = [
+    "nearest_birthday_reminders_producer",
+    "OpenProducerInteractors",
+    "ProducerInteractors",
+    "Scheduler",
+    "ScheduledJob",
+    "ShardLocker",
+]
 
+from .nearest_birthday_reminders import (
+    OpenProducerInteractors,
+    ProducerInteractors,
+)
 from .nearest_birthday_reminders import (
     producer as nearest_birthday_reminders_producer,
 )
+from .scheduler import ScheduledJob, Scheduler
+from .shard_locker import ShardLocker
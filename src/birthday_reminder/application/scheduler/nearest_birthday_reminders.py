@@ -1,134 +1,438 @@
 import asyncio
-from asyncio import Queue
-from calendar import isleap
-from datetime import datetime, timedelta
+from contextlib import AbstractAsyncContextManager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import partial
 from logging import getLogger
+from typing import Callable
+
+import pytz
+from uuid6 import uuid7
 
 from birthday_reminder.application.birthday_remind.queries import (
-    GetByInterval,
-    GetByIntervalRequest,
+    StreamBySlot,
+    StreamBySlotRequest,
 )
 from birthday_reminder.application.common.exceptions import RepoError
+from birthday_reminder.application.delivery.commands import AddDeliveries
+from birthday_reminder.application.scheduler_checkpoint.commands import (
+    SaveSchedulerCheckpoint,
+)
+from birthday_reminder.application.scheduler_checkpoint.queries import (
+    GetByName,
+)
+from birthday_reminder.application.user.queries import GetTimezones
 from birthday_reminder.config import Reminder as ReminderConfig
 from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    ReminderType,
+)
+from birthday_reminder.domain.delivery.entities import Delivery
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
+from birthday_reminder.domain.scheduler_checkpoint.exceptions import (
+    NameNotFound,
+)
+from birthday_reminder.metrics import PRODUCER_WINDOW_REMINDERS
+
+from .scheduler import Scheduler
+from .shard_locker import ShardLocker
 
 logger = getLogger(__name__)
 
+# The number of rows fetched from the server-side cursor at once
+STREAM_BATCH_SIZE = 1000
+# The name of the checkpoint of the last processed slot, a shard is added to it in the sharding mode
+CHECKPOINT_NAME = "nearest_birthday_reminders"
+SLOT = timedelta(hours=1)
+
+
+@dataclass
+class Slot:
+    """
+    Users whose local delivery time falls in the current hour.
+    Timezones with the same local hour and date are grouped, so they are selected by one query.
+    """
+
+    timezones: list[str]
+    include_unset_timezone: bool
+    # More than one hour if the hours before were skipped by a DST transition
+    hours: list[int]
+    include_unset_hour: bool
+    today: date
+    # The local date when the slot is produced, it's later than `today` for a replayed slot
+    current_date: date
+
+
+def get_local_hours(at: datetime, tz: pytz.BaseTzInfo) -> list[int]:
+    """
+    Get local hours of the slot starting at `at` in `tz`.
+    Local hours that don't exist because of a DST transition (e.g. 02:00 when clocks go forward from 02:00 to 03:00)
+    are added to the first existing hour after them, so users with such an hour still get their reminders.
+    """
+
+    local = at.astimezone(tz).replace(tzinfo=None)
+    previous = (at - SLOT).astimezone(tz).replace(tzinfo=None)
+
+    hours = []
+
+    skipped = previous + SLOT
+    while skipped < local:
+        hours.append(skipped.hour)
+        skipped += SLOT
+
+    hours.append(local.hour)
+
+    return hours
+
+
+def get_slots(
+    at: datetime,
+    timezones: list[str],
+    config: ReminderConfig,
+    now: datetime,
+) -> list[Slot]:
+    """
+    Get slots for the hour starting at `at`, produced at `now`.
+    Users without the timezone use the timezone from the config, and users without the hour use the hour from the config.
+    """
+
+    slots: dict[tuple[tuple[int, ...], date, date], Slot] = {}
+
+    for name in {*timezones, config.tz.zone}:
+        try:
+            tz = pytz.timezone(name)
+        except pytz.UnknownTimeZoneError:
+            logger.warn("Unknown timezone", extra={"timezone": name})
+
+            continue
+
+        local = at.astimezone(tz)
+        hours = get_local_hours(at, tz)
+        current_date = now.astimezone(tz).date()
+
+        slot = slots.setdefault(
+            (tuple(hours), local.date(), current_date),
+            Slot(
+                [],
+                False,
+                hours,
+                config.hour in hours,
+                local.date(),
+                current_date,
+            ),
+        )
+        slot.timezones.append(name)
+
+        if name == config.tz.zone:
+            slot.include_unset_timezone = True
+
+    return list(slots.values())
+
+
+def get_reminder_type(
+    remind: BirthdayRemind, today: date, current_date: date
+) -> ReminderType | None:
+    """
+    Get the type of the reminder from the slot's `today` to be sent on `current_date`.
+    If the birthday has already passed by `current_date`, the reminder isn't sent.
+    """
+
+    if remind.day == today.day and remind.month == today.month:
+        birthday = today
+    else:
+        birthday = today + timedelta(days=1)
+
+    days = (birthday - current_date).days
+    if days < 0:
+        return None
+    if days == 0:
+        return ReminderType.OnTheDay
+
+    return ReminderType.BeforehandInOneDay
+
+
+async def produce_slot(
+    slot: Slot,
+    shard: int,
+    shard_count: int,
+    stream_by_slot: StreamBySlot,
+    add_deliveries: AddDeliveries,
+    rate: float | None = None,
+) -> None:
+    """
+    Stream reminders of the slot in the shard and add them to the delivery outbox.
+    Reminders that are already in the outbox (e.g. delivered) are skipped by the outbox.
+    The type of a reminder is taken from the current local date, so a replayed slot doesn't send
+    a passed birthday as "today" or today's birthday as "tomorrow", and reminders of passed birthdays are skipped.
+    If `rate` is set, deliveries can't be claimed faster than `rate` per second:
+    every delivery gets the time it can be claimed at, and the next batch is added after the times of the previous one.
+    """
+
+    # The 29 February reminders are in the interval from 28 February to 1 March,
+    # so in a non-leap year they are sent as "tomorrow" on 28 February.
+    today = slot.today
+    tomorrow = today + timedelta(days=1)
+
+    logger.debug(
+        f"Querying for reminders between {today.day}/{today.month} and {tomorrow.day}/{tomorrow.month} "
+        f"for {slot.hours} hours in {slot.timezones}"
+    )
+
+    reminders_count = 0
+    produced_count = 0
+
+    async for batch in stream_by_slot(
+        StreamBySlotRequest(
+            slot.timezones,
+            slot.include_unset_timezone,
+            slot.hours,
+            slot.include_unset_hour,
+            today.day,
+            today.month,
+            tomorrow.day,
+            tomorrow.month,
+            shard,
+            shard_count,
+            STREAM_BATCH_SIZE,
+        )
+    ):
+        reminders_count += len(batch)
+
+        deliveries = []
+        for reminder in batch:
+            reminder_type = get_reminder_type(
+                reminder.remind, today, slot.current_date
+            )
+            if reminder_type is None:
+                continue
+
+            deliveries.append(
+                Delivery(
+                    uuid7(),
+                    reminder.remind.id,
+                    slot.current_date.year,
+                    reminder_type,
+                )
+            )
+
+        if rate is not None:
+            started_at = datetime.now(tz=timezone.utc)
+            for number, delivery in enumerate(deliveries):
+                delivery.not_before = started_at + timedelta(
+                    seconds=number / rate
+                )
+
+        added_count = await add_deliveries(deliveries)
+
+        produced_count += added_count
+
+        if rate is not None:
+            await asyncio.sleep(len(deliveries) / rate)
+
+    PRODUCER_WINDOW_REMINDERS.observe(reminders_count)
+
+    logger.debug(
+        f"Reminders count: {reminders_count}, produced: {produced_count}"
+    )
+
+
+@dataclass
+class ProducerInteractors:
+    """
+    Interactors of the producer bound to one database session.
+    """
+
+    get_timezones: GetTimezones
+    stream_by_slot: StreamBySlot
+    add_deliveries: AddDeliveries
+    get_checkpoint: GetByName
+    save_checkpoint: SaveSchedulerCheckpoint
+
+
+OpenProducerInteractors = Callable[
+    [], AbstractAsyncContextManager[ProducerInteractors]
+]
+
+
+def get_checkpoint_name(shard: int, shard_count: int) -> str:
+    if shard_count == 1:
+        return CHECKPOINT_NAME
+
+    return f"{CHECKPOINT_NAME}:{shard}/{shard_count}"
+
 
 async def producer(
     config: ReminderConfig,
-    queue: Queue[BirthdayRemind],
-    get_by_interval: GetByInterval,
+    scheduler: Scheduler,
+    shard_locker: ShardLocker,
+    open_interactors: OpenProducerInteractors,
 ) -> None:
     """
-    This function is a producer that queries the database for birthday reminders that are due in the next 24 hours and
-    puts them in the queue.
+    This function is a producer that schedules streaming of birthday reminders every hour.
+    Every slot streams reminders of users whose local delivery time falls in this hour and adds them
+    to the delivery outbox in batches, so deliveries survive restarts and are shared by all consumers.
+    Already delivered reminders aren't added again, because the outbox keeps one delivery per reminder, year and type.
+
+    Reminders are split into `config.shard_count` shards by the user. Every slot, the instance processes its own shard
+    (`config.shard_index`) and, after `config.shard_takeover_delay` seconds, shards of other instances that haven't
+    been processed, e.g. because their instance is dead. A shard is locked while it's processed,
+    so it's never processed by two instances at once.
+
+    The last processed slot of every shard is saved as a checkpoint. Slots missed since the checkpoint
+    (but not older than `config.catch_up_hours`) are replayed after the current one at `config.catch_up_messages_per_second`.
+    Replays are idempotent for the same reason.
 
-    :param queue: The queue where the birthday reminders will be put.
-    :param query: The query to be used to get the birthday reminders.
+    Every slot and every checkpoint access opens its own interactors by `open_interactors`,
+    so database sessions are short-lived and aren't shared between concurrent tasks.
+
+    :param config: The reminder config with the default timezone and hour for users who haven't set them.
+    :param scheduler: The scheduler where the slots are scheduled.
+    :param shard_locker: The locker of shards between instances.
+    :param open_interactors: The factory of interactors bound to a new database session.
 
     :return: None
     """
 
-    logger.info("Starting the producer")
+    # Shards processed by this instance now. Advisory locks are reentrant, so they don't protect from the same instance.
+    busy_shards: set[int] = set()
+
+    async def produce(
+        shard: int, slot_at: datetime, rate: float | None = None
+    ) -> None:
+        async with open_interactors() as interactors:
+            timezones = await interactors.get_timezones()
 
-    while True:
-        now = datetime.now(tz=config.tz)
+            for slot in get_slots(
+                slot_at, timezones, config, datetime.now(tz=timezone.utc)
+            ):
+                await produce_slot(
+                    slot,
+                    shard,
+                    config.shard_count,
+                    interactors.stream_by_slot,
+                    interactors.add_deliveries,
+                    rate,
+                )
 
-        # If the current hour is less than the hour set in the config, sleep until that hour.
-        if now.hour < config.hour:
-            config_datetime = config.get_datetime()
-            remaining = config_datetime - now
+    async def process_slots(shard: int, current_slot_at: datetime) -> None:
+        name = get_checkpoint_name(shard, config.shard_count)
 
+        try:
+            async with open_interactors() as interactors:
+                checkpoint = (
+                    await interactors.get_checkpoint(name)
+                ).processed_at
+        except NameNotFound:
+            logger.info(
+                "Checkpoint not found, starting from the current slot",
+                extra={"shard": shard},
+            )
+
+            checkpoint = current_slot_at - SLOT
+
+        if checkpoint >= current_slot_at:
             logger.debug(
-                f"Sleeping until {config_datetime.strftime('%H:%M:%S')}. Remaining: {remaining}. Waiting for the configured hour."
+                "The shard is already processed", extra={"shard": shard}
             )
 
-            await asyncio.sleep(remaining.total_seconds())
+            return
 
-        # If today is 27 February, tomorrow is 28 February if it's a leap year, otherwise it's 1 March.
-        # This need to be handled for cases when the current year isn't a leap year,
-        # but we need to remind the user about the birthday of a person who was born on 29 February.
-        # If the current year is a leap year, we don't need to handle this case because 29 February is a valid date.
-        if now.month == 2 and now.day == 27:
-            if isleap(now.year):
-                tomorrow = now.replace(month=2, day=28, tzinfo=config.tz)
-            else:
-                tomorrow = now.replace(month=3, day=1, tzinfo=config.tz)
-        # If today is 28 February, tomorrow is 29 February if it's a leap year, otherwise it's 1 March.
-        elif now.month == 2 and now.day == 28:
-            if isleap(now.year):
-                tomorrow = now.replace(month=2, day=29, tzinfo=config.tz)
-            else:
-                tomorrow = now.replace(month=3, day=1, tzinfo=config.tz)
-        # If today is 31 December, tomorrow is 1 January of the next year.
-        elif now.month == 12 and now.day == 31:
-            tomorrow = now.replace(
-                year=now.year + 1, month=1, day=1, tzinfo=config.tz
+        # Too old slots aren't replayed, because their reminders are already outdated
+        missed_from = max(
+            checkpoint + SLOT,
+            current_slot_at - timedelta(hours=config.catch_up_hours),
+        )
+
+        await produce(shard, current_slot_at)
+
+        slot_at = missed_from
+        while slot_at < current_slot_at:
+            logger.info(
+                f"Replaying the missed slot {slot_at.strftime('%Y-%m-%d %H:%M:%S')} UTC",
+                extra={"shard": shard},
             )
-        # For all other cases, tomorrow is the next day or the next month if the next day is the first day of the next month.
-        else:
-            try:
-                tomorrow = now.replace(day=now.day + 1, tzinfo=config.tz)
-            except ValueError:
-                tomorrow = now.replace(
-                    month=now.month + 1, day=1, tzinfo=config.tz
-                )
 
-        start_day = now.day
-        start_month = now.month
-        end_day = tomorrow.day
-        end_month = tomorrow.month
+            await produce(shard, slot_at, config.catch_up_messages_per_second)
+
+            slot_at += SLOT
+
+        async with open_interactors() as interactors:
+            await interactors.save_checkpoint(
+                SchedulerCheckpoint(name, current_slot_at)
+            )
+
+    async def process_shard(shard: int) -> None:
+        if shard in busy_shards:
+            return
 
-        logger.debug(
-            f"Querying for reminders between {start_day}/{start_month} and {end_day}/{end_month}"
+        current_slot_at = datetime.now(tz=timezone.utc).replace(
+            minute=0, second=0, microsecond=0
         )
 
+        busy_shards.add(shard)
         try:
-            reminders = await get_by_interval(
-                GetByIntervalRequest(
-                    start_day, start_month, end_day, end_month
+            if not await shard_locker.try_lock(shard):
+                logger.debug(
+                    "The shard is locked by another instance",
+                    extra={"shard": shard},
                 )
-            )
+
+                return
+
+            try:
+                await process_slots(shard, current_slot_at)
+            finally:
+                await shard_locker.unlock(shard)
         except RepoError as err:
-            logger.error(
-                "Error while getting reminders by interval", exc_info=err
-            )
+            logger.error("Error while processing the shard", exc_info=err)
 
-            await asyncio.sleep(5)
+            scheduler.call_later(5, partial(process_shard, shard))
 
-            continue
+            return
         except Exception as err:
             logger.critical(
-                "Unknown error while getting reminders by interval",
-                exc_info=err,
+                "Unknown error while processing the shard", exc_info=err
             )
 
-            await asyncio.sleep(5)
+            scheduler.call_later(5, partial(process_shard, shard))
 
-            continue
+            return
+        finally:
+            busy_shards.discard(shard)
+
+        # The next slot could start while the shard was processed
+        if datetime.now(tz=timezone.utc) >= current_slot_at + SLOT:
+            scheduler.call_later(0, partial(process_shard, shard))
 
-        logger.debug(f"Reminders count: {len(reminders)}")
+    async def tick(slot_at: datetime) -> None:
+        for shard in range(config.shard_count):
+            if shard == config.shard_index:
+                scheduler.call_later(0, partial(process_shard, shard))
+            else:
+                # Give the owner of the shard time to process it
+                scheduler.call_later(
+                    config.shard_takeover_delay,
+                    partial(process_shard, shard),
+                )
 
-        for reminder in reminders:
-            logger.debug(f"Produced: {reminder}")
+        next_slot_at = slot_at + SLOT
 
-            await queue.put(reminder)
+        logger.debug(f"Next slot at {next_slot_at.strftime('%H:%M:%S')} UTC")
 
-        # Replace the current day with the next day and sleep until the hour set in the config
-        next_day_with_config_hour = now.replace(
-            hour=config.hour,
-            minute=0,
-            second=0,
-            microsecond=0,
-            fold=0,
-        ) + timedelta(days=1)
+        scheduler.call_at(next_slot_at, partial(tick, next_slot_at))
 
-        remaining = next_day_with_config_hour - now
+    logger.info(
+        "Starting the producer",
+        extra={
+            "shard_index": config.shard_index,
+            "shard_count": config.shard_count,
+        },
+    )
 
-        logger.debug(
-            f"Sleeping until {next_day_with_config_hour.strftime('%H:%M:%S')}. "
-            f"Remaining: {remaining}. Waiting for the next day."
-        )
+    now = datetime.now(tz=timezone.utc)
 
-        await asyncio.sleep(remaining.total_seconds())
+    scheduler.call_at(
+        now, partial(tick, now.replace(minute=0, second=0, microsecond=0))
+    )
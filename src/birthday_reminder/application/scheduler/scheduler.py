@@ -0,0 +1,113 @@
+import asyncio
+import heapq
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import count
+from logging import getLogger
+from typing import Awaitable, Callable
+
+logger = getLogger(__name__)
+
+Callback = Callable[[], Awaitable[None]]
+
+# The runner wakes up at least this often, so changes of the wall clock are noticed
+MAX_SLEEP = 60.0
+
+
+@dataclass(order=True)
+class ScheduledJob:
+    when: float
+    number: int
+    callback: Callback = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+    def cancel(self) -> None:
+        # The job stays in the heap and is dropped when it gets to the top
+        self.cancelled = True
+
+
+class Scheduler:
+    """
+    An in-process scheduler of delayed jobs.
+    Jobs are kept in a heap ordered by their due time, so insert is O(log n) and cancel is O(1).
+    One runner sleeps until the nearest job is due and starts it in a separate task, so long jobs don't delay other ones.
+    """
+
+    def __init__(self) -> None:
+        self._jobs: list[ScheduledJob] = []
+        self._numbers = count()
+        self._changed = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+
+    def call_at(self, when: datetime, callback: Callback) -> ScheduledJob:
+        """
+        Schedule `callback` to be called at `when`. `when` should be timezone-aware.
+        If `when` is in the past, the callback is called as soon as possible.
+        """
+
+        return self._push(when.timestamp(), callback)
+
+    def call_later(self, delay: float, callback: Callback) -> ScheduledJob:
+        """
+        Schedule `callback` to be called after `delay` seconds.
+        """
+
+        return self._push(time.time() + delay, callback)
+
+    def _push(self, when: float, callback: Callback) -> ScheduledJob:
+        job = ScheduledJob(when, next(self._numbers), callback)
+
+        heapq.heappush(self._jobs, job)
+
+        # Wake up the runner if the new job is due earlier than the one it waits for
+        if self._jobs[0] is job:
+            self._changed.set()
+
+        return job
+
+    async def _fire(self, job: ScheduledJob) -> None:
+        try:
+            await job.callback()
+        except Exception as err:
+            logger.critical("Unknown error in the scheduled job", exc_info=err)
+
+    async def run(self) -> None:
+        """
+        Fire jobs at their due time.
+        Running jobs are cancelled when the task is cancelled.
+        """
+
+        logger.info("Starting the scheduler")
+
+        try:
+            while True:
+                self._changed.clear()
+
+                while self._jobs and self._jobs[0].cancelled:
+                    heapq.heappop(self._jobs)
+
+                if self._jobs:
+                    timeout = min(self._jobs[0].when - time.time(), MAX_SLEEP)
+                else:
+                    timeout = MAX_SLEEP
+
+                if timeout > 0:
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+
+                    continue
+
+                job = heapq.heappop(self._jobs)
+
+                task = asyncio.create_task(self._fire(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        finally:
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,17 @@
+from abc import abstractmethod
+from typing import Protocol
+
+
+class ShardLocker(Protocol):
+    """
+    Locks shards of reminders between instances of the bot, so every shard is processed by one instance at a time.
+    A lock is released if its instance dies, so the shard is taken over by another one.
+    """
+
+    @abstractmethod
+    async def try_lock(self, shard: int) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def unlock(self, shard: int) -> None:
+        raise NotImplementedError
@@ -0,0 +1,4 @@
+__all__ = ["SchedulerCheckpointReader", "SchedulerCheckpointRepo"]
+
+from .reader import Reader as SchedulerCheckpointReader
+from .repo import Repo as SchedulerCheckpointRepo
@@ -0,0 +1,21 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.scheduler_checkpoint import (
+    SchedulerCheckpointRepo,
+)
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
+
+
+class SaveSchedulerCheckpoint(Interactor[SchedulerCheckpoint, None]):
+    def __init__(
+        self,
+        scheduler_checkpoint_repo: SchedulerCheckpointRepo,
+        uow: UnitOfWork,
+    ):
+        self.scheduler_checkpoint_repo = scheduler_checkpoint_repo
+        self.uow = uow
+
+    async def __call__(self, checkpoint: SchedulerCheckpoint) -> None:
+        await self.scheduler_checkpoint_repo.save(checkpoint)
+        await self.uow.commit()
@@ -0,0 +1,3 @@
+__all__ = ["GetByName"]
+
+from .get_by_name import GetByName
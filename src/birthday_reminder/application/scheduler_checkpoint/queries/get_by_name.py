@@ -0,0 +1,20 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.scheduler_checkpoint import (
+    SchedulerCheckpointReader,
+)
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
+
+
+class GetByName(Interactor[str, SchedulerCheckpoint]):
+    def __init__(
+        self,
+        scheduler_checkpoint_reader: SchedulerCheckpointReader,
+        uow: UnitOfWork,
+    ):
+        self.scheduler_checkpoint_reader = scheduler_checkpoint_reader
+        self.uow = uow
+
+    async def __call__(self, name: str) -> SchedulerCheckpoint:
+        return await self.scheduler_checkpoint_reader.get_by_name(name)
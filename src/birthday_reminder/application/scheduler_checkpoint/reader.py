@@ -0,0 +1,12 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
+
+
+class Reader(Protocol):
+    @abstractmethod
+    async def get_by_name(self, name: str) -> SchedulerCheckpoint:
+        raise NotImplementedError
@@ -0,0 +1,12 @@
+from abc import abstractmethod
+from typing import Protocol
+
+from birthday_reminder.domain.scheduler_checkpoint.entities import (
+    SchedulerCheckpoint,
+)
+
+
+class Repo(Protocol):
+    @abstractmethod
+    async def save(self, checkpoint: SchedulerCheckpoint) -> None:
+        raise NotImplementedError
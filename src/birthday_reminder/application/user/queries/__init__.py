@@ -1,5 +1,6 @@
-__all__ = ["GetByID", "GetByTgID", "GetUsersStats"]
+__all__ = ["GetByID", "GetByTgID", "GetTimezones", "GetUsersStats"]
 
 from .get_by_id import GetByID
 from .get_by_tg_id import GetByTgID
+from .get_timezones import GetTimezones
 from .get_users_stats import GetUsersStats
@@ -0,0 +1,15 @@
+from birthday_reminder.application.common import Interactor, UnitOfWork
+from birthday_reminder.application.user import UserReader
+
+
+class GetTimezones(Interactor[None, list[str]]):
+    def __init__(
+        self,
+        user_reader: UserReader,
+        uow: UnitOfWork,
+    ):
+        self.user_reader = user_reader
+        self.uow = uow
+
+    async def __call__(self) -> list[str]:
+        return await self.user_reader.get_timezones()
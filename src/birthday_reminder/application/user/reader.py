@@ -17,3 +17,7 @@ class Reader(Protocol):
     @abstractmethod
     async def get_users_stats(self) -> UsersStats:
         raise NotImplementedError
+
+    @abstractmethod
+    async def get_timezones(self) -> list[str]:
+        raise NotImplementedError
@@ -1,7 +1,6 @@
 import json
 import logging
 from dataclasses import dataclass, field
-from datetime import datetime
 from logging import getLogger
 from os import environ
 from pathlib import Path
@@ -26,6 +25,20 @@ logger = getLogger(__name__)
 @dataclass
 class Bot:
     token: str
+    # The base URL of the Bot API server, e.g. a local one for load testing. If it isn't set, `api.telegram.org` is used
+    api_url: str | None = None
+    # Limits of requests to chats enforced for all outgoing requests of the bot
+    messages_per_second: float = 30.0
+    chat_messages_per_second: float = 1.0
+    group_messages_per_minute: float = 20.0
+
+    def __post_init__(self):
+        if (
+            self.messages_per_second <= 0
+            or self.chat_messages_per_second <= 0
+            or self.group_messages_per_minute <= 0
+        ):
+            raise ValueError("Bot rate limits must be greater than 0")
 
 
 @dataclass
@@ -33,21 +46,101 @@ class Reminder:
     hour: int
     tz_raw: str
     tz: pytz.BaseTzInfo = field(init=False)
+    workers: int = 4
+    messages_per_second: float = 25.0
+    completed_buffer_size: int = 100
+    completed_flush_interval_ms: int = 500
+    queue_size: int = 1000
+    catch_up_hours: int = 48
+    catch_up_messages_per_second: float = 5.0
+    shard_index: int = 0
+    shard_count: int = 1
+    shard_takeover_delay: int = 60
+    outbox_batch_size: int = 100
+    # Should be longer than the time deliveries wait in the consumer queues
+    outbox_lease: int = 300
+    outbox_poll_interval_ms: int = 1000
+    # Send reminders of a user from one slot as one message
+    digest: bool = False
+    # Failed deliveries are retried with exponential backoff until the number of attempts reaches the max
+    retry_max_attempts: int = 5
+    retry_base_delay: int = 30
+    retry_max_delay: int = 3600
+    # The time in seconds to finish in-flight sends on shutdown
+    shutdown_timeout: int = 10
+    # `rows` stores a row for every completed reminder, `bitmask` stores a bit for every reminder type in a row per reminder and year
+    completed_storage: str = "rows"
 
     def __post_init__(self):
         if not 0 <= self.hour <= 23:
             raise ValueError("Hour must be between 0 and 23")
 
+        if self.workers < 1:
+            raise ValueError("Workers count must be greater than 0")
+
+        if self.messages_per_second <= 0:
+            raise ValueError("Messages per second must be greater than 0")
+
+        if self.completed_buffer_size < 1:
+            raise ValueError("Completed buffer size must be greater than 0")
+
+        if self.completed_flush_interval_ms < 1:
+            raise ValueError(
+                "Completed flush interval must be greater than 0"
+            )
+
+        if self.queue_size < 1:
+            raise ValueError("Queue size must be greater than 0")
+
+        if self.catch_up_hours < 0:
+            raise ValueError("Catch-up hours must be non-negative")
+
+        if self.catch_up_messages_per_second <= 0:
+            raise ValueError(
+                "Catch-up messages per second must be greater than 0"
+            )
+
+        if self.shard_count < 1:
+            raise ValueError("Shard count must be greater than 0")
+
+        if not 0 <= self.shard_index < self.shard_count:
+            raise ValueError(
+                "Shard index must be between 0 and shard count - 1"
+            )
+
+        if self.shard_takeover_delay < 0:
+            raise ValueError("Shard takeover delay must be non-negative")
+
+        if self.outbox_batch_size < 1:
+            raise ValueError("Outbox batch size must be greater than 0")
+
+        if self.outbox_lease < 1:
+            raise ValueError("Outbox lease must be greater than 0")
+
+        if self.outbox_poll_interval_ms < 1:
+            raise ValueError("Outbox poll interval must be greater than 0")
+
+        if self.retry_max_attempts < 1:
+            raise ValueError("Retry max attempts must be greater than 0")
+
+        if not 0 < self.retry_base_delay <= self.retry_max_delay:
+            raise ValueError(
+                "Retry base delay must be greater than 0 and not greater than the max delay"
+            )
+
+        if self.shutdown_timeout < 0:
+            raise ValueError("Shutdown timeout must be non-negative")
+
+        if self.completed_storage not in ("rows", "bitmask"):
+            raise ValueError(
+                f"Unknown completed storage: {self.completed_storage}"
+            )
+
         try:
             self.tz = pytz.timezone(self.tz_raw)
         except pytz.UnknownTimeZoneError:
             raise ValueError(f"Unknown timezone: {self.tz_raw}")
 
-    def get_datetime(self) -> datetime:
-        return datetime.now(tz=self.tz).replace(
-            hour=self.hour, minute=0, second=0, microsecond=0
-        )
-
 
 @dataclass
 class Media:
@@ -104,6 +197,39 @@ class Database:
         return f"postgresql+asyncpg://{self.user}:{self.password}@{self.host}:{self.port}/{self.database}"
 
 
+@dataclass
+class Metrics:
+    enabled: bool = True
+    host: str = "0.0.0.0"
+    port: int = 5000
+
+
+@dataclass
+class Retention:
+    enabled: bool = True
+    # Completed reminders and done deliveries of years older than this number of years before the current one are removed
+    years: int = 1
+    batch_size: int = 1000
+    # The pause between batches, so archiving doesn't compete with deliveries
+    pause_ms: int = 500
+    # The time in seconds between runs
+    interval: int = 86400
+
+    def __post_init__(self):
+        # Users behind UTC still get reminders of the previous year on the 1st of January
+        if self.years < 1:
+            raise ValueError("Retention years must be greater than 0")
+
+        if self.batch_size < 1:
+            raise ValueError("Retention batch size must be greater than 0")
+
+        if self.pause_ms < 0:
+            raise ValueError("Retention pause must be non-negative")
+
+        if self.interval < 1:
+            raise ValueError("Retention interval must be greater than 0")
+
+
 @dataclass
 class Config:
     bot: Bot
@@ -112,14 +238,77 @@ class Config:
     logging: Logging
     localization: Localization
     database: Database
+    metrics: Metrics
+    retention: Retention
 
 
 def load_config_from_env() -> Config:
     raw_path = environ.get("LOGGING_PATH")
 
-    bot = Bot(token=environ["BOT_TOKEN"])
+    raw_api_url = environ.get("BOT_API_URL", "").strip()
+
+    bot = Bot(
+        token=environ["BOT_TOKEN"],
+        api_url=raw_api_url or None,
+        messages_per_second=float(
+            environ.get("BOT_MESSAGES_PER_SECOND", "30").strip()
+        ),
+        chat_messages_per_second=float(
+            environ.get("BOT_CHAT_MESSAGES_PER_SECOND", "1").strip()
+        ),
+        group_messages_per_minute=float(
+            environ.get("BOT_GROUP_MESSAGES_PER_MINUTE", "20").strip()
+        ),
+    )
     reminder = Reminder(
-        hour=int(environ["REMINDER_HOUR"]), tz_raw=environ["REMINDER_TZ"]
+        hour=int(environ["REMINDER_HOUR"]),
+        tz_raw=environ["REMINDER_TZ"],
+        workers=int(environ.get("REMINDER_WORKERS", "4").strip()),
+        messages_per_second=float(
+            environ.get("REMINDER_MESSAGES_PER_SECOND", "25").strip()
+        ),
+        completed_buffer_size=int(
+            environ.get("REMINDER_COMPLETED_BUFFER_SIZE", "100").strip()
+        ),
+        completed_flush_interval_ms=int(
+            environ.get("REMINDER_COMPLETED_FLUSH_INTERVAL_MS", "500").strip()
+        ),
+        queue_size=int(environ.get("REMINDER_QUEUE_SIZE", "1000").strip()),
+        catch_up_hours=int(
+            environ.get("REMINDER_CATCH_UP_HOURS", "48").strip()
+        ),
+        catch_up_messages_per_second=float(
+            environ.get("REMINDER_CATCH_UP_MESSAGES_PER_SECOND", "5").strip()
+        ),
+        shard_index=int(environ.get("REMINDER_SHARD_INDEX", "0").strip()),
+        shard_count=int(environ.get("REMINDER_SHARD_COUNT", "1").strip()),
+        shard_takeover_delay=int(
+            environ.get("REMINDER_SHARD_TAKEOVER_DELAY", "60").strip()
+        ),
+        outbox_batch_size=int(
+            environ.get("REMINDER_OUTBOX_BATCH_SIZE", "100").strip()
+        ),
+        outbox_lease=int(environ.get("REMINDER_OUTBOX_LEASE", "300").strip()),
+        outbox_poll_interval_ms=int(
+            environ.get("REMINDER_OUTBOX_POLL_INTERVAL_MS", "1000").strip()
+        ),
+        digest=environ.get("REMINDER_DIGEST", "false").strip().lower()
+        == "true",
+        retry_max_attempts=int(
+            environ.get("REMINDER_RETRY_MAX_ATTEMPTS", "5").strip()
+        ),
+        retry_base_delay=int(
+            environ.get("REMINDER_RETRY_BASE_DELAY", "30").strip()
+        ),
+        retry_max_delay=int(
+            environ.get("REMINDER_RETRY_MAX_DELAY", "3600").strip()
+        ),
+        shutdown_timeout=int(
+            environ.get("REMINDER_SHUTDOWN_TIMEOUT", "10").strip()
+        ),
+        completed_storage=environ.get(
+            "REMINDER_COMPLETED_STORAGE", "rows"
+        ).strip(),
     )
     media = Media(capybara_path=Path(environ["MEDIA_CAPYBARA_PATH"]))
     logging = Logging(
@@ -147,6 +336,20 @@ def load_config_from_env() -> Config:
         password=environ["POSTGRES_PASSWORD"].strip(),
         database=environ["POSTGRES_DB"].strip(),
     )
+    metrics = Metrics(
+        enabled=environ.get("METRICS_ENABLED", "true").strip().lower()
+        == "true",
+        host=environ.get("METRICS_HOST", "0.0.0.0").strip(),
+        port=int(environ.get("METRICS_PORT", "5000").strip()),
+    )
+    retention = Retention(
+        enabled=environ.get("RETENTION_ENABLED", "true").strip().lower()
+        == "true",
+        years=int(environ.get("RETENTION_YEARS", "1").strip()),
+        batch_size=int(environ.get("RETENTION_BATCH_SIZE", "1000").strip()),
+        pause_ms=int(environ.get("RETENTION_PAUSE_MS", "500").strip()),
+        interval=int(environ.get("RETENTION_INTERVAL", "86400").strip()),
+    )
 
     return Config(
         bot=bot,
@@ -155,6 +358,8 @@ def load_config_from_env() -> Config:
         logging=logging,
         localization=localization,
         database=database,
+        metrics=metrics,
+        retention=retention,
     )
 
 
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
+from datetime import date
 from uuid import UUID
 
+from birthday_reminder.domain.user.entities import User
+
 
 @dataclass
 class BirthdayRemind:
@@ -9,6 +12,14 @@ class BirthdayRemind:
     name: str
     day: int
     month: int
+    # The date of the nearest birthday, it's moved forward every night after the birthday passes
+    next_occurrence: date | None = None
+
+
+@dataclass
+class BirthdayRemindWithUser:
+    remind: BirthdayRemind
+    user: User
 
 
 @dataclass
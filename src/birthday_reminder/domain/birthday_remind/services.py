@@ -0,0 +1,23 @@
+from calendar import isleap
+from datetime import date
+
+
+def get_occurrence_day(day: int, month: int, year: int) -> int:
+    # 29 February is celebrated on 28 February in non-leap years
+    if month == 2 and day == 29 and not isleap(year):
+        return 28
+
+    return day
+
+
+def get_next_occurrence(day: int, month: int, today: date) -> date:
+    """
+    Get the date of the nearest birthday on `today` or after it.
+    """
+
+    for year in (today.year, today.year + 1):
+        occurrence = date(year, month, get_occurrence_day(day, month, year))
+        if occurrence >= today:
+            return occurrence
+
+    raise AssertionError("A birthday occurs every year")
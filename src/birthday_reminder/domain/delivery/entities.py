@@ -0,0 +1,43 @@
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    ReminderType,
+)
+from birthday_reminder.domain.user.entities import User
+
+
+@dataclass
+class Delivery:
+    id: UUID
+    birthday_remind_id: UUID
+    year: int
+    reminder_type: ReminderType
+    # The number of failed attempts to send the delivery
+    attempts: int = 0
+    # The delivery isn't claimed before this time, it's used to pace replayed deliveries
+    not_before: datetime | None = None
+
+
+@dataclass
+class DeliveryWithRemind:
+    delivery: Delivery
+    remind: BirthdayRemind
+    user: User
+
+
+@dataclass
+class DeliveryFailure:
+    delivery: Delivery
+    error: str
+
+
+@dataclass
+class DeliveryRetry:
+    id: UUID
+    attempts: int
+    last_error: str
+    # If it isn't set, the delivery is given up
+    retry_at: datetime | None
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+
+@dataclass
+class SchedulerCheckpoint:
+    name: str
+    # All slots up to and including this one are processed
+    processed_at: datetime
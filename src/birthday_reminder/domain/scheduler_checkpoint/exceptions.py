@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+from birthday_reminder.domain.common.exceptions import DomainException
+
+
+@dataclass(eq=False)
+class NameNotFound(DomainException):
+    name: str
+
+    @property
+    def title(self) -> str:
+        return f"A scheduler checkpoint with name {self.name} not found"
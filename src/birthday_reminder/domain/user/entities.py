@@ -7,6 +7,8 @@ class User:
     id: UUID
     language_code: str | None
     tg_id: int
+    timezone: str | None = None
+    reminder_hour: int | None = None
 
 
 @dataclass
@@ -109,6 +109,32 @@ birthday-coming-soon =
 birthday-today =
     Today is { $name }'s birthday! 🎉
 
+birthday-digest-today =
+    Today is the birthday of your friends: { $names }! 🎉
+
+birthday-digest-tomorrow =
+    Don't forget that tomorrow is the birthday of your friends: { $names }!
+
+settings-timezone =
+    Your timezone: { $timezone }
+    To change it, send /timezone with the name of your timezone, e.g. /timezone Europe/London
+
+settings-timezone-unknown =
+    Unknown timezone. Use a name from the tz database, e.g. Europe/London or America/New_York.
+
+settings-timezone-success =
+    Timezone is set to { $timezone }.
+
+settings-hour =
+    Reminders are sent at { $hour }:00 of your timezone.
+    To change the hour, send /hour with a number from 0 to 23, e.g. /hour 9
+
+settings-hour-invalid =
+    The hour should be a number from 0 to 23.
+
+settings-hour-success =
+    Reminders will be sent at { $hour }:00 of your timezone.
+
 dialog-error =
     Something went wrong. Please try using the new dialog.
 
@@ -109,6 +109,32 @@ birthday-coming-soon =
 birthday-today =
     Сегодня день рождения у { $name }! 🎉
 
+birthday-digest-today =
+    Сегодня день рождения у твоих друзей: { $names }! 🎉
+
+birthday-digest-tomorrow =
+    Не забудь, что завтра день рождения у твоих друзей: { $names }!
+
+settings-timezone =
+    Твой часовой пояс: { $timezone }
+    Чтобы изменить его, отправь /timezone с названием часового пояса, например /timezone Europe/Moscow
+
+settings-timezone-unknown =
+    Неизвестный часовой пояс. Используй название из базы tz, например Europe/Moscow или Asia/Yekaterinburg.
+
+settings-timezone-success =
+    Часовой пояс изменен на { $timezone }.
+
+settings-hour =
+    Напоминания приходят в { $hour }:00 по твоему часовому поясу.
+    Чтобы изменить час, отправь /hour с числом от 0 до 23, например /hour 9
+
+settings-hour-invalid =
+    Час должен быть числом от 0 до 23.
+
+settings-hour-success =
+    Напоминания будут приходить в { $hour }:00 по твоему часовому поясу.
+
 dialog-error =
     Что-то пошло не так. Пожалуйста, используйте новый диалог.
 
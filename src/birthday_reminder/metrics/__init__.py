@@ -0,0 +1,59 @@
+__all__ = [
+    "REGISTRY",
+    "QUEUE_SIZE",
+    "PRODUCER_WINDOW_REMINDERS",
+    "SEND_SECONDS",
+    "TELEGRAM_RETRY_AFTER",
+    "DB_QUERY_SECONDS",
+    "UPDATE_SECONDS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "run_server",
+]
+
+from .registry import Counter, Gauge, Histogram, Registry
+from .server import run_server
+
+REGISTRY = Registry()
+
+QUEUE_SIZE = REGISTRY.register(
+    Gauge(
+        "birthday_reminder_queue_size",
+        "Rendered payloads waiting in the queue of the consumer",
+    )
+)
+PRODUCER_WINDOW_REMINDERS = REGISTRY.register(
+    Histogram(
+        "birthday_reminder_producer_window_reminders",
+        "Reminders streamed for one slot window by the producer",
+        buckets=(0, 10, 100, 1_000, 10_000, 100_000, 1_000_000),
+    )
+)
+SEND_SECONDS = REGISTRY.register(
+    Histogram(
+        "birthday_reminder_send_seconds",
+        "Latency of successful requests to send a reminder",
+    )
+)
+TELEGRAM_RETRY_AFTER = REGISTRY.register(
+    Counter(
+        "birthday_reminder_telegram_retry_after_total",
+        "Requests rejected by Telegram with `TelegramRetryAfter`",
+    )
+)
+DB_QUERY_SECONDS = REGISTRY.register(
+    Histogram(
+        "birthday_reminder_db_query_seconds",
+        "Latency of repository methods, streams are measured per fetched batch",
+        ["method"],
+    )
+)
+UPDATE_SECONDS = REGISTRY.register(
+    Histogram(
+        "birthday_reminder_update_seconds",
+        "Latency of handling an update by a handler",
+        ["handler"],
+    )
+)
@@ -0,0 +1,228 @@
+from bisect import bisect_left
+from typing import Callable, Iterable, TypeVar
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+
+    pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"'
+        for name, value in zip(names, values)
+    )
+
+    return f"{{{pairs}}}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value))
+
+
+class Metric:
+    type: str
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _check_labels(self, labels: tuple[str, ...]) -> None:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(
+                f"Metric {self.name} expects labels {self.labelnames}, got {labels}"
+            )
+
+    def collect(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+            *self.collect(),
+        ]
+
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """
+    A monotonically increasing value.
+    """
+
+    type = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self._check_labels(labels)
+
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def collect(self) -> list[str]:
+        return [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """
+    A value that can go up and down.
+    A function can be set instead of the value, so the value is read only when metrics are collected.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+
+        self._values: dict[tuple[str, ...], float] = {}
+        self._functions: dict[tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, *labels: str) -> None:
+        self._check_labels(labels)
+
+        self._values[labels] = value
+
+    def set_function(
+        self, function: Callable[[], float], *labels: str
+    ) -> None:
+        self._check_labels(labels)
+
+        self._functions[labels] = function
+
+    def collect(self) -> list[str]:
+        values = {
+            **self._values,
+            **{
+                labels: function()
+                for labels, function in self._functions.items()
+            },
+        }
+
+        return [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in values.items()
+        ]
+
+
+class Histogram(Metric):
+    """
+    A distribution of values in cumulative buckets.
+    Observing is a binary search and a few additions, so it's cheap enough for hot paths.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, documentation, labelnames)
+
+        self.buckets = tuple(sorted(buckets))
+        # Counts of values in every bucket (not cumulative), the last one is `+Inf`, the sum and the count
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        try:
+            counts, total = self._values[labels]
+        except KeyError:
+            self._check_labels(labels)
+
+            counts, total = [0] * (len(self.buckets) + 1), [0.0]
+            self._values[labels] = (counts, total)
+
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def collect(self) -> list[str]:
+        lines = []
+
+        labelnames = (*self.labelnames, "le")
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+
+                lines.append(
+                    f"{self.name}_bucket{format_labels(labelnames, (*labels, format_value(bound)))} {cumulative}"
+                )
+
+            lines.append(
+                f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total[0])}"
+            )
+            lines.append(
+                f"{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}"
+            )
+
+        return lines
+
+
+MetricType = TypeVar("MetricType", bound=Metric)
+
+
+class Registry:
+    """
+    A set of metrics rendered in the Prometheus text format.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: MetricType) -> MetricType:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+
+        self._metrics[metric.name] = metric
+
+        return metric
+
+    def render(self) -> str:
+        return (
+            "\n".join(metric.render() for metric in self._metrics.values())
+            + "\n"
+        )
@@ -0,0 +1,46 @@
+import asyncio
+from logging import getLogger
+
+from aiohttp import web
+
+from .registry import Registry
+
+logger = getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def run_server(registry: Registry, host: str, port: int) -> None:
+    """
+    Serve metrics of the registry at `/metrics` until the task is cancelled.
+    The server runs in the event loop of the bot, and metrics are rendered only when they're scraped.
+
+    :param registry: The registry to be rendered.
+    :param host: The host to listen on.
+    :param port: The port to listen on.
+
+    :return: None
+    """
+
+    async def handle(_: web.Request) -> web.Response:
+        return web.Response(
+            body=registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+
+    try:
+        await web.TCPSite(runner, host, port).start()
+
+        logger.info(
+            "Metrics server started", extra={"host": host, "port": port}
+        )
+
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -0,0 +1,11 @@
+__all__ = [
+    "RateGovernor",
+    "RateGovernorMiddleware",
+    "bulk_priority",
+]
+
+from .rate_governor import (
+    RateGovernor,
+    RateGovernorMiddleware,
+    bulk_priority,
+)
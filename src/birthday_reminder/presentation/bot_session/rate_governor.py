@@ -0,0 +1,209 @@
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from logging import getLogger
+from typing import Iterator
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from birthday_reminder.metrics import TELEGRAM_RETRY_AFTER
+
+logger = getLogger(__name__)
+
+# Telegram allows short bursts to one chat, but not more than about a message per second on average
+CHAT_BURST = 3.0
+# The share of the global burst that bulk requests leave for interactive ones
+BULK_RESERVE = 0.2
+# Buckets of the least recently used chats are dropped when there are more than this number of them
+MAX_CHAT_BUCKETS = 10_000
+
+_bulk: ContextVar[bool] = ContextVar("bulk", default=False)
+
+
+@contextmanager
+def bulk_priority() -> Iterator[None]:
+    """
+    Mark requests made in this context as bulk, e.g. scheduled reminders, so interactive replies go first.
+    """
+
+    token = _bulk.set(True)
+    try:
+        yield
+    finally:
+        _bulk.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = burst
+        self._updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def get_wait(self, now: float, reserve: float = 0.0) -> float:
+        """
+        Get seconds until a token can be taken, leaving `reserve` tokens in the bucket.
+        """
+
+        self._refill(now)
+
+        needed = 1 + reserve
+        if self._tokens >= needed:
+            return 0
+
+        return (needed - self._tokens) / self.rate
+
+    def take(self) -> None:
+        self._tokens -= 1
+
+
+class RateGovernor:
+    """
+    A process-wide governor of requests to Telegram.
+    Every request takes a token from the global bucket, and requests to chats take one from the bucket of the chat too.
+    Bulk requests leave a part of the buckets for interactive ones and wait while interactive ones are waiting.
+    When Telegram asks to retry after some time, all requests are paused.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        group_rate: float,
+    ) -> None:
+        self._global = TokenBucket(global_rate, global_rate)
+        self._chat_rate = chat_rate
+        self._group_rate = group_rate
+
+        self._chats: OrderedDict[int | str, TokenBucket] = OrderedDict()
+        self._paused_until = 0.0
+        self._interactive_waiting = 0
+
+    def _get_chat_bucket(self, chat_id: int | str) -> TokenBucket:
+        try:
+            bucket = self._chats[chat_id]
+        except KeyError:
+            pass
+        else:
+            self._chats.move_to_end(chat_id)
+
+            return bucket
+
+        # A chat unused for a long time has a full bucket anyway, so dropping it doesn't let it exceed the limit
+        while len(self._chats) >= MAX_CHAT_BUCKETS:
+            self._chats.popitem(last=False)
+
+        # Private chats have positive ids, groups and channels have negative ones or usernames
+        is_private = isinstance(chat_id, int) and chat_id > 0
+
+        bucket = self._chats[chat_id] = TokenBucket(
+            self._chat_rate if is_private else self._group_rate,
+            CHAT_BURST,
+        )
+
+        return bucket
+
+    def pause(self, seconds: float) -> None:
+        """
+        Pause all requests for `seconds`.
+        """
+
+        self._paused_until = max(
+            self._paused_until, time.monotonic() + seconds
+        )
+
+        logger.warn("Requests paused", extra={"seconds": seconds})
+
+    async def acquire(self, chat_id: int | str | None, bulk: bool) -> None:
+        # Requests without a chat (e.g. answers to callback queries) are limited only by the global bucket
+        chat = self._get_chat_bucket(chat_id) if chat_id is not None else None
+
+        if not bulk:
+            self._interactive_waiting += 1
+
+        try:
+            while True:
+                now = time.monotonic()
+
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if bulk:
+                        wait = max(
+                            self._global.get_wait(
+                                now, self._global.burst * BULK_RESERVE
+                            ),
+                            chat.get_wait(now, 1) if chat else 0,
+                        )
+
+                        # Let interactive requests take the next tokens
+                        if not wait and self._interactive_waiting:
+                            wait = 1 / self._global.rate
+                    else:
+                        wait = max(
+                            self._global.get_wait(now),
+                            chat.get_wait(now) if chat else 0,
+                        )
+
+                if wait <= 0:
+                    self._global.take()
+                    if chat:
+                        chat.take()
+
+                    return
+
+                await asyncio.sleep(wait)
+        finally:
+            if not bulk:
+                self._interactive_waiting -= 1
+
+
+class RateGovernorMiddleware(BaseRequestMiddleware):
+    """
+    This middleware is responsible for passing all requests through the rate governor.
+    Requests rejected with `TelegramRetryAfter` pause the governor and are retried up to `max_retries` times.
+    """
+
+    def __init__(self, governor: RateGovernor, max_retries: int = 3) -> None:
+        self.governor = governor
+        self.max_retries = max_retries
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        bulk = _bulk.get()
+
+        retries = 0
+        while True:
+            await self.governor.acquire(chat_id, bulk)
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as err:
+                TELEGRAM_RETRY_AFTER.inc()
+
+                self.governor.pause(err.retry_after)
+
+                if retries >= self.max_retries:
+                    raise
+
+                retries += 1
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from logging import getLogger
 from typing import Any, Literal
 
@@ -25,8 +26,10 @@ from uuid6 import uuid7
 from birthday_reminder.application.birthday_remind import BirthdayRemindRepo
 from birthday_reminder.application.birthday_remind.commands import (
     AddBirthdayRemind,
+    AddBirthdayRemindRequest,
 )
 from birthday_reminder.application.common import UnitOfWork
+from birthday_reminder.config import Config
 from birthday_reminder.domain.birthday_remind.entities import (
     BirthdayRemind as BirthdayRemindDB,
 )
@@ -226,6 +229,7 @@ async def create_remind_confirmed(
     db_user: UserDB = data["db_user"]
     uow: UnitOfWork = data["uow"]
     birthday_remind_repo: BirthdayRemindRepo = data["birthday_remind_repo"]
+    config: Config = data["config"]
 
     reminder_info = await remind_info_getter(manager)
 
@@ -244,12 +248,15 @@ async def create_remind_confirmed(
     )
 
     await command(
-        BirthdayRemindDB(
-            id=uuid7(),
-            user_id=db_user.id,
-            name=name,
-            month=month_number,
-            day=day,
+        AddBirthdayRemindRequest(
+            birthday_remind=BirthdayRemindDB(
+                id=uuid7(),
+                user_id=db_user.id,
+                name=name,
+                month=month_number,
+                day=day,
+            ),
+            today=datetime.now(config.reminder.tz).date(),
         )
     )
 
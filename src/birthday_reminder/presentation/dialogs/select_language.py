@@ -1,3 +1,4 @@
+from dataclasses import replace
 from logging import getLogger
 from typing import Any
 
@@ -77,9 +78,7 @@ async def on_language_selected(
 
     query = GetByUserID(birthday_remind_reader, uow)
 
-    await command(
-        UserDB(id=db_user.id, language_code=selected_item, tg_id=db_user.tg_id)
-    )
+    await command(replace(db_user, language_code=selected_item))
 
     logger.debug("Get birthday reminds")
 
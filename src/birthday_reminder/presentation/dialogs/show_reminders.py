@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import datetime
 from logging import getLogger
 
 from aiogram import F
@@ -11,6 +11,10 @@ from birthday_reminder.application.birthday_remind.queries import (
     GetByUserIDAndSortByNearestRequest,
 )
 from birthday_reminder.application.common import UnitOfWork
+from birthday_reminder.config import Config
+from birthday_reminder.domain.birthday_remind.services import (
+    get_next_occurrence,
+)
 from birthday_reminder.domain.user.entities import User as UserDB
 from birthday_reminder.presentation.i18n import (
     I18N_FORMAT_KEY,
@@ -36,130 +40,54 @@ async def reminders_getter(dialog_manager: DialogManager, **_kwargs) -> dict:
     birthday_remind_reader: BirthdayRemindReader = data[
         "birthday_remind_reader"
     ]
+    config: Config = data["config"]
 
     query = GetByUserIDAndSortByNearest(birthday_remind_reader, uow)
 
-    today = date.today()
+    today = datetime.now(config.reminder.tz).date()
+
+    reminders = await query(GetByUserIDAndSortByNearestRequest(db_user.id))
+
+    dated_reminders = []
+    for remind in reminders:
+        birth_date = remind.next_occurrence
+        # The date is stale until the nightly roll after midnight
+        if birth_date is None or birth_date < today:
+            birth_date = get_next_occurrence(remind.day, remind.month, today)
 
-    reminders = await query(
-        GetByUserIDAndSortByNearestRequest(db_user.id, today.day, today.month)
-    )
+        dated_reminders.append((birth_date, remind))
+
+    # Stale rows are ordered by the old date, so sort again after the recompute
+    dated_reminders.sort(key=lambda item: item[0])
 
     texts = []
 
     format_text: FormatText = dialog_manager.middleware_data[I18N_FORMAT_KEY]
 
-    for number, remind in enumerate(reminders, start=1):
-        # Get datetime of the birthday by its day and month.
-        try:
-            birth_date = date(today.year, remind.month, remind.day)
-
-            # If birthday have already been this year, then add 1 year to the date.
-            # If the date can't be in the next year (extra day of leap year), then minus 1 day.
-            if birth_date < today:
-                try:
-                    birth_date = date(today.year + 1, remind.month, remind.day)
-                except ValueError:
-                    birth_date = date(
-                        today.year + 1, remind.month, remind.day - 1
-                    )
-
-                    difference = birth_date - today
-
-                    texts.append(
-                        "{number}) {text}".format(
-                            number=number,
-                            text=format_text(
-                                "show-reminders-text-not-leap-year",
-                                {
-                                    "name": remind.name,
-                                    "date": format_date(
-                                        birth_date,
-                                        format="d MMMM",
-                                        locale=db_user.language_code,
-                                    ),
-                                    "days": difference.days,
-                                },
-                            ),
-                        ),
-                    )
-
-                    continue
-
-            difference = birth_date - today
-
-            texts.append(
-                "{number}) {text}".format(
-                    number=number,
-                    text=format_text(
-                        "show-reminders-text",
-                        {
-                            "name": remind.name,
-                            "date": format_date(
-                                birth_date,
-                                format="d MMMM",
-                                locale=db_user.language_code,
-                            ),
-                            "days": difference.days,
-                        },
-                    ),
-                ),
-            )
-        except ValueError:
-            # If the date is can't be in this year (extra day of leap year), then minus 1 day.
-            birth_date = date(today.year, remind.month, remind.day - 1)
-
-            # If birthday have already been this year, then add 1 year to the date.
-            # If the date can't be in the next year (extra day of leap year), then minus 1 day.
-            if birth_date < today:
-                try:
-                    birth_date = date(today.year + 1, remind.month, remind.day)
-
-                    difference = birth_date - today
-
-                    texts.append(
-                        "{number}) {text}".format(
-                            number=number,
-                            text=format_text(
-                                "show-reminders-text",
-                                {
-                                    "name": remind.name,
-                                    "date": format_date(
-                                        birth_date,
-                                        format="d MMMM",
-                                        locale=db_user.language_code,
-                                    ),
-                                    "days": difference.days,
-                                },
-                            ),
+    for number, (birth_date, remind) in enumerate(dated_reminders, start=1):
+        # 29 February is shown as 28 February in non-leap years
+        if birth_date.day != remind.day:
+            text_key = "show-reminders-text-not-leap-year"
+        else:
+            text_key = "show-reminders-text"
+
+        texts.append(
+            "{number}) {text}".format(
+                number=number,
+                text=format_text(
+                    text_key,
+                    {
+                        "name": remind.name,
+                        "date": format_date(
+                            birth_date,
+                            format="d MMMM",
+                            locale=db_user.language_code,
                         ),
-                    )
-
-                    continue
-                except ValueError:
-                    birth_date = date(
-                        today.year + 1, remind.month, remind.day - 1
-                    )
-
-            difference = birth_date - today
-
-            texts.append(
-                "{number}) {text}".format(
-                    number=number,
-                    text=format_text(
-                        "show-reminders-text-not-leap-year",
-                        {
-                            "name": remind.name,
-                            "date": format_date(
-                                birth_date,
-                                format="d MMMM",
-                                locale=db_user.language_code,
-                            ),
-                            "days": difference.days,
-                        },
-                    ),
+                        "days": (birth_date - today).days,
+                    },
                 ),
-            )
+            ),
+        )
 
     return {
         REMINDERS_TEXT_KEY: "\n".join(texts),
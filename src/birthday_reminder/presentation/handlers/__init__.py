@@ -2,10 +2,12 @@ __all__ = [
     "start_router",
     "stats_router",
     "language_router",
+    "settings_router",
     "dialog_exception_handler",
 ]
 
 from .error import dialog_exception as dialog_exception_handler
 from .language import router as language_router
+from .settings import router as settings_router
 from .start import router as start_router
 from .stats import router as stats_router
@@ -0,0 +1,94 @@
+from dataclasses import replace
+from logging import getLogger
+
+import pytz
+from aiogram import Router
+from aiogram.filters import Command, CommandObject, invert_f
+from aiogram.types import Message
+
+from birthday_reminder.application.common import UnitOfWork
+from birthday_reminder.application.user import UserRepo
+from birthday_reminder.application.user.commands import UpdateUser
+from birthday_reminder.config import Config
+from birthday_reminder.domain.user.entities import User as UserDB
+from birthday_reminder.presentation.i18n import FormatText
+
+from ..filters import is_new_user_filter
+
+__all__ = ["router"]
+
+logger = getLogger(__name__)
+
+router = Router(name="settings_router")
+
+
+@router.message(Command("timezone", "tz"), invert_f(is_new_user_filter))
+async def set_timezone(
+    message: Message,
+    command: CommandObject,
+    db_user: UserDB,
+    uow: UnitOfWork,
+    user_repo: UserRepo,
+    format_text: FormatText,
+    config: Config,
+) -> None:
+    if not command.args:
+        text = format_text(
+            "settings-timezone",
+            {"timezone": db_user.timezone or config.reminder.tz_raw},
+        )
+    elif command.args.strip() not in pytz.all_timezones_set:
+        text = format_text("settings-timezone-unknown", None)
+    else:
+        timezone = command.args.strip()
+
+        logger.debug("Update user timezone", extra={"timezone": timezone})
+
+        await UpdateUser(user_repo, uow)(replace(db_user, timezone=timezone))
+
+        text = format_text("settings-timezone-success", {"timezone": timezone})
+
+    await message.answer(
+        text,
+        parse_mode=None,
+        disable_web_page_preview=True,
+        disable_notification=False,
+    )
+
+
+@router.message(Command("hour"), invert_f(is_new_user_filter))
+async def set_reminder_hour(
+    message: Message,
+    command: CommandObject,
+    db_user: UserDB,
+    uow: UnitOfWork,
+    user_repo: UserRepo,
+    format_text: FormatText,
+    config: Config,
+) -> None:
+    if not command.args:
+        hour = db_user.reminder_hour
+        if hour is None:
+            hour = config.reminder.hour
+
+        text = format_text("settings-hour", {"hour": hour})
+    elif (
+        not command.args.strip().isdigit()
+        or not 0 <= int(command.args.strip()) <= 23
+    ):
+        text = format_text("settings-hour-invalid", None)
+    else:
+        hour = int(command.args.strip())
+
+        logger.debug("Update user reminder hour", extra={"hour": hour})
+
+        await UpdateUser(user_repo, uow)(replace(db_user, reminder_hour=hour))
+
+        text = format_text("settings-hour-success", {"hour": hour})
+
+    await message.answer(
+        text,
+        parse_mode=None,
+        disable_web_page_preview=True,
+        disable_notification=False,
+    )
@@ -1,5 +1,11 @@
-__all__ = ["DatabaseMiddleware", "UserMiddleware", "I18nMiddleware"]
+__all__ = [
+    "DatabaseMiddleware",
+    "UserMiddleware",
+    "I18nMiddleware",
+    "MetricsMiddleware",
+]
 
 from .database import DatabaseMiddleware
 from .i18n import I18nMiddleware
+from .metrics import MetricsMiddleware
 from .user import UserMiddleware
@@ -0,0 +1,29 @@
+import time
+from typing import Any, Awaitable, Callable
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from birthday_reminder.metrics import UPDATE_SECONDS
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """
+    This middleware is responsible for measuring the latency of handling an update by a handler.
+    It should be registered as an inner middleware, because the handler isn't resolved for outer ones.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        callback = data["handler"].callback
+        name = getattr(callback, "__qualname__", type(callback).__name__)
+
+        started_at = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            UPDATE_SECONDS.observe(time.perf_counter() - started_at, name)
@@ -1,5 +1,50 @@
-__all__ = ["nearest_birthday_reminders_consumer"]
+__all__ = [
+    "archive_completed",
+    "archiver",
+    "drop_year",
+    "get_stored_years",
+    "nearest_birthday_reminders_consumer",
+    "nearest_birthday_reminders_claimer",
+    "next_occurrences_roller",
+    "claim_completions",
+    "claim_deliveries",
+    "complete_deliveries",
+    "prepare_years",
+    "prune_deliveries",
+    "producer_interactors",
+    "release_deliveries",
+    "retry_deliveries",
+    "roll_next_occurrences",
+    "RateLimiter",
+    "Payload",
+    "Renderer",
+    "years_preparer",
+]
 
+from .maintenance import (
+    archive_completed,
+    archiver,
+    drop_year,
+    get_stored_years,
+    next_occurrences_roller,
+    prepare_years,
+    prune_deliveries,
+    roll_next_occurrences,
+    years_preparer,
+)
+from .nearest_birthday_reminders import (
+    claim_completions,
+    claim_deliveries,
+    complete_deliveries,
+    producer_interactors,
+    release_deliveries,
+    retry_deliveries,
+)
+from .nearest_birthday_reminders import (
+    claimer as nearest_birthday_reminders_claimer,
+)
 from .nearest_birthday_reminders import (
     consumer as nearest_birthday_reminders_consumer,
 )
+from .rate_limiter import RateLimiter
+from .renderer import Payload, Renderer
@@ -0,0 +1,326 @@
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+from logging import getLogger
+from typing import Awaitable, Callable
+from uuid import UUID
+
+import pytz
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from birthday_reminder.adapters.database import (
+    CompletedBirthdayRemindStorage,
+    SQLAlchemyUoW,
+)
+from birthday_reminder.adapters.database.repositories import (
+    BirthdayRemindRepoImpl,
+    DeliveryRepoImpl,
+)
+from birthday_reminder.application.birthday_remind.commands import (
+    RollNextOccurrences,
+)
+from birthday_reminder.application.common.exceptions import RepoError
+from birthday_reminder.application.completed_birthday_remind.commands import (
+    ArchiveCompletedBirthdayReminds,
+    ArchiveRequest,
+    DropYear,
+    PrepareYears,
+)
+from birthday_reminder.application.completed_birthday_remind.queries import (
+    GetStoredYears,
+)
+from birthday_reminder.application.delivery.commands import (
+    PruneDeliveries,
+    PruneDeliveriesRequest,
+)
+from birthday_reminder.config import Retention as RetentionConfig
+
+logger = getLogger(__name__)
+
+# Years are prepared daily, so the next year is ready long before its first reminder
+PREPARE_YEARS_INTERVAL = 24 * 60 * 60
+PREPARE_YEARS_RETRY_INTERVAL = 60
+ROLL_NEXT_OCCURRENCES_RETRY_INTERVAL = 60
+
+
+def get_years_to_prepare(now: datetime) -> list[int]:
+    # Local dates of users differ from the UTC one by a day at most, so the neighbouring years are used too
+    return [now.year - 1, now.year, now.year + 1]
+
+
+async def prepare_years(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+    years: list[int],
+) -> None:
+    async with pool() as session:
+        command = PrepareYears(storage.repo(session), SQLAlchemyUoW(session))
+
+        await command(years)
+
+
+async def get_stored_years(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+) -> list[int]:
+    async with pool() as session:
+        query = GetStoredYears(storage.reader(session), SQLAlchemyUoW(session))
+
+        return await query()
+
+
+async def archive_completed(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+    request: ArchiveRequest,
+) -> UUID | None:
+    async with pool() as session:
+        command = ArchiveCompletedBirthdayReminds(
+            storage.repo(session), SQLAlchemyUoW(session)
+        )
+
+        return await command(request)
+
+
+async def drop_year(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+    year: int,
+) -> bool:
+    async with pool() as session:
+        command = DropYear(storage.repo(session), SQLAlchemyUoW(session))
+
+        return await command(year)
+
+
+async def prune_deliveries(
+    pool: async_sessionmaker[AsyncSession],
+    request: PruneDeliveriesRequest,
+) -> UUID | None:
+    async with pool() as session:
+        command = PruneDeliveries(
+            DeliveryRepoImpl(session), SQLAlchemyUoW(session)
+        )
+
+        return await command(request)
+
+
+async def roll_next_occurrences(
+    pool: async_sessionmaker[AsyncSession],
+    today: date,
+) -> int:
+    async with pool() as session:
+        command = RollNextOccurrences(
+            BirthdayRemindRepoImpl(session), SQLAlchemyUoW(session)
+        )
+
+        return await command(today)
+
+
+def get_seconds_until_tomorrow(tz: pytz.BaseTzInfo) -> float:
+    now = datetime.now(tz=tz)
+    tomorrow = tz.localize(
+        datetime.combine(now.date() + timedelta(days=1), time())
+    )
+
+    return (tomorrow - now).total_seconds()
+
+
+async def next_occurrences_roller(
+    roll: Callable[[date], Awaitable[int]],
+    tz: pytz.BaseTzInfo,
+) -> None:
+    """
+    Move next occurrences of passed birthdays forward on startup and after every midnight in `tz`.
+    One set-based update per day keeps the column current, so readers don't compute the dates themselves.
+
+    The date in `tz` (the default timezone of users) is used for all reminders.
+    Readers in other timezones recompute a date that isn't rolled for them yet.
+
+    :param roll: The function that moves next occurrences of passed birthdays forward.
+    :param tz: The timezone whose date is used.
+
+    :return: None
+    """
+
+    while True:
+        today = datetime.now(tz=tz).date()
+
+        try:
+            count = await roll(today)
+        except RepoError as err:
+            logger.error(
+                "Error while rolling next occurrences of birthdays",
+                extra={"today": today},
+                exc_info=err,
+            )
+
+            await asyncio.sleep(ROLL_NEXT_OCCURRENCES_RETRY_INTERVAL)
+
+            continue
+        except Exception as err:
+            logger.critical(
+                "Unknown error while rolling next occurrences of birthdays",
+                extra={"today": today},
+                exc_info=err,
+            )
+
+            await asyncio.sleep(ROLL_NEXT_OCCURRENCES_RETRY_INTERVAL)
+
+            continue
+
+        logger.debug(
+            "Next occurrences of birthdays rolled",
+            extra={"today": today, "count": count},
+        )
+
+        await asyncio.sleep(get_seconds_until_tomorrow(tz))
+
+
+async def years_preparer(
+    prepare: Callable[[list[int]], Awaitable[None]],
+) -> None:
+    """
+    Prepare the storage of completed reminders for the current, the previous and the next years every day.
+
+    :param prepare: The function that prepares the storage for the years.
+
+    :return: None
+    """
+
+    while True:
+        years = get_years_to_prepare(datetime.now(tz=timezone.utc))
+
+        try:
+            await prepare(years)
+        except RepoError as err:
+            logger.error(
+                "Error while preparing years of completed reminders",
+                extra={"years": years},
+                exc_info=err,
+            )
+
+            await asyncio.sleep(PREPARE_YEARS_RETRY_INTERVAL)
+
+            continue
+        except Exception as err:
+            logger.critical(
+                "Unknown error while preparing years of completed reminders",
+                extra={"years": years},
+                exc_info=err,
+            )
+
+            await asyncio.sleep(PREPARE_YEARS_RETRY_INTERVAL)
+
+            continue
+
+        logger.debug(
+            "Years of completed reminders prepared", extra={"years": years}
+        )
+
+        await asyncio.sleep(PREPARE_YEARS_INTERVAL)
+
+
+async def archive_year(
+    archive: Callable[[ArchiveRequest], Awaitable[UUID | None]],
+    drop_year: Callable[[int], Awaitable[bool]],
+    config: RetentionConfig,
+    year: int,
+) -> None:
+    batches_count = 0
+    after_id = None
+    while True:
+        after_id = await archive(
+            ArchiveRequest(year, after_id, config.batch_size)
+        )
+        if after_id is None:
+            break
+
+        batches_count += 1
+
+        await asyncio.sleep(config.pause_ms / 1000)
+
+    if not await drop_year(year):
+        logger.warn(
+            "Some completed reminders of the year are left, they will be archived on the next run",
+            extra={"year": year},
+        )
+
+        return
+
+    logger.info(
+        "Completed reminders of the year archived",
+        extra={"year": year, "batches_count": batches_count},
+    )
+
+
+async def prune_outbox(
+    prune: Callable[[PruneDeliveriesRequest], Awaitable[UUID | None]],
+    config: RetentionConfig,
+    before_year: int,
+) -> None:
+    batches_count = 0
+    after_id = None
+    while True:
+        after_id = await prune(
+            PruneDeliveriesRequest(before_year, after_id, config.batch_size)
+        )
+        if after_id is None:
+            break
+
+        batches_count += 1
+
+        await asyncio.sleep(config.pause_ms / 1000)
+
+    if batches_count:
+        logger.info(
+            "Done deliveries of old years pruned",
+            extra={"before_year": before_year, "batches_count": batches_count},
+        )
+
+
+async def archiver(
+    get_stored_years: Callable[[], Awaitable[list[int]]],
+    archive: Callable[[ArchiveRequest], Awaitable[UUID | None]],
+    drop_year: Callable[[int], Awaitable[bool]],
+    prune: Callable[[PruneDeliveriesRequest], Awaitable[UUID | None]],
+    config: RetentionConfig,
+) -> None:
+    """
+    Move completed reminders of old years to the archive every `config.interval` seconds.
+    Only the reminders of recent years are needed to skip delivered ones, so the table of completed reminders stays small.
+
+    Reminders are moved in batches of `config.batch_size` with pauses of `config.pause_ms` between them,
+    so archiving never holds locks for long or writes much WAL at once, even during the delivery of reminders.
+    The storage of the year is dropped after all its reminders are moved.
+    Done deliveries of the same years are deleted from the outbox by the same batched loop,
+    because it keeps the same key of every reminder.
+
+    :param get_stored_years: The function that returns years with stored completed reminders.
+    :param archive: The function that moves a batch of completed reminders to the archive.
+    :param drop_year: The function that drops the storage of an archived year.
+    :param prune: The function that deletes a batch of done deliveries of old years.
+    :param config: The retention config.
+
+    :return: None
+    """
+
+    while True:
+        before_year = datetime.now(tz=timezone.utc).year - config.years
+
+        try:
+            for year in await get_stored_years():
+                if year < before_year:
+                    await archive_year(archive, drop_year, config, year)
+
+            await prune_outbox(prune, config, before_year)
+        except RepoError as err:
+            logger.error(
+                "Error while archiving completed reminders", exc_info=err
+            )
+        except Exception as err:
+            logger.critical(
+                "Unknown error while archiving completed reminders",
+                exc_info=err,
+            )
+
+        await asyncio.sleep(config.interval)
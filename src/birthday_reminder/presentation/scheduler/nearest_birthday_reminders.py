@@ -1,192 +1,519 @@
 import asyncio
+import time
 from asyncio import Queue
-from datetime import date
+from contextlib import asynccontextmanager
 from logging import getLogger
+from typing import AsyncIterator, Awaitable, Callable
+from uuid import UUID
 
 from aiogram import Bot
-from aiogram.exceptions import (
-    RestartingTelegram,
-    TelegramForbiddenError,
-    TelegramNetworkError,
-    TelegramNotFound,
-    TelegramRetryAfter,
-    TelegramServerError,
-)
-from fluent.runtime import FluentLocalization
-from uuid6 import uuid7
+from aiogram.exceptions import TelegramForbiddenError, TelegramNotFound
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
+from birthday_reminder.adapters.database import (
+    CompletedBirthdayRemindStorage,
+    SQLAlchemyUoW,
+)
+from birthday_reminder.adapters.database.repositories import (
+    BirthdayRemindReaderImpl,
+    DeliveryRepoImpl,
+    SchedulerCheckpointReaderImpl,
+    SchedulerCheckpointRepoImpl,
+    UserReaderImpl,
+)
+from birthday_reminder.application.birthday_remind.queries import (
+    StreamBySlot,
+)
+from birthday_reminder.application.common import WriteBuffer
 from birthday_reminder.application.common.exceptions import RepoError
-from birthday_reminder.application.completed_birthday_remind.commands import (
-    AddCompletedBirthdayRemind,
+from birthday_reminder.application.delivery.commands import (
+    AddDeliveries,
+    ClaimCompletions,
+    ClaimDeliveries,
+    ClaimDeliveriesRequest,
+    CompleteDeliveries,
+    ReleaseDeliveries,
+    RetryDeliveries,
+    RetryDeliveriesRequest,
+    RetryPolicy,
 )
-from birthday_reminder.application.completed_birthday_remind.queries import (
-    GetByBirthdayRemindIDAndYear,
+from birthday_reminder.application.scheduler import ProducerInteractors
+from birthday_reminder.application.scheduler_checkpoint.commands import (
+    SaveSchedulerCheckpoint,
 )
-from birthday_reminder.application.user.queries import GetByID
-from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
-from birthday_reminder.domain.completed_birthday_remind.entities import (
-    CompletedBirthdayRemind,
-    ReminderType,
+from birthday_reminder.application.scheduler_checkpoint.queries import (
+    GetByName as GetSchedulerCheckpointByName,
 )
-from birthday_reminder.domain.completed_birthday_remind.exceptions import (
-    IDForYearAndTypeNotFound,
+from birthday_reminder.application.user.queries import GetTimezones
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryFailure,
+    DeliveryWithRemind,
 )
-from birthday_reminder.domain.user.exceptions import IDNotFound
+from birthday_reminder.metrics import SEND_SECONDS
+from birthday_reminder.presentation.bot_session import bulk_priority
+
+from .rate_limiter import RateLimiter
+from .renderer import Payload, Renderer
 
 logger = getLogger(__name__)
 
 
-async def send_message_with_retries(
+async def send_message(
     bot: Bot,
+    rate_limiter: RateLimiter,
     user_id: int,
     text: str,
     parse_mode: str | None = None,
 ) -> None:
-    while True:
-        try:
-            await bot.send_message(
-                user_id,
-                text,
-                parse_mode=parse_mode,
-                disable_web_page_preview=True,
-                disable_notification=False,
-            )
+    await rate_limiter.acquire()
 
-            break
-        except TelegramRetryAfter as err:
-            logger.warn(
-                "TelegramRetryAfter",
-                extra={"retry_after": err.retry_after},
-            )
+    started_at = time.perf_counter()
 
-            await asyncio.sleep(err.retry_after)
-        except TelegramNetworkError as err:
-            logger.error("TelegramNetworkError", exc_info=err)
+    await bot.send_message(
+        user_id,
+        text,
+        parse_mode=parse_mode,
+        disable_web_page_preview=True,
+        disable_notification=False,
+    )
 
-            await asyncio.sleep(5)
-        except (TelegramNotFound, TelegramForbiddenError) as err:
-            logger.error(
-                "TelegramNotFound or TelegramForbiddenError", exc_info=err
-            )
+    SEND_SECONDS.observe(time.perf_counter() - started_at)
+
+
+async def handle_payload(
+    payload: Payload,
+    claim_completions: Callable[[list[Delivery]], Awaitable[list[Delivery]]],
+    renderer: Renderer,
+    completed_buffer: WriteBuffer[Delivery],
+    failed_buffer: WriteBuffer[DeliveryFailure],
+    bot: Bot,
+    rate_limiter: RateLimiter,
+) -> None:
+    logger.info(f"Consumed: {payload}")
+
+    try:
+        deliveries = await claim_completions(payload.deliveries)
+    except Exception as err:
+        # Nothing is recorded as completed, so the deliveries are sent after their lease expires
+        logger.error(
+            "Error while claiming completion of deliveries", exc_info=err
+        )
+
+        return
+
+    if not deliveries:
+        logger.info(
+            "Reminders of the payload are already completed, skipping",
+            extra={"chat_id": payload.chat_id},
+        )
+
+        return
 
-            break
-        except (TelegramServerError, RestartingTelegram) as err:
-            logger.error(
-                "TelegramServerError or RestartingTelegram", exc_info=err
+    try:
+        # Reminders of a digest that were completed before are already marked as done by the claim
+        if len(deliveries) != len(payload.deliveries):
+            payload = renderer.narrow(payload, deliveries)
+
+        await send_message(
+            bot,
+            rate_limiter,
+            payload.chat_id,
+            payload.text,
+            parse_mode=None,
+        )
+    except (TelegramNotFound, TelegramForbiddenError) as err:
+        # The chat is unavailable (e.g. the bot is blocked), so retries won't help
+        logger.error(
+            "TelegramNotFound or TelegramForbiddenError", exc_info=err
+        )
+    except Exception as err:
+        # The worker doesn't wait for the retry, so other payloads aren't stuck behind this one
+        logger.error(
+            "Error while sending the reminder, it will be retried",
+            exc_info=err,
+        )
+
+        for delivery in deliveries:
+            failed_buffer.add(
+                DeliveryFailure(delivery, f"{type(err).__name__}: {err}")
             )
 
-            await asyncio.sleep(5)
-        except Exception as err:
-            logger.error("Unknown error", exc_info=err)
+        return
+
+    # Every delivery is marked as done separately, even if it's sent in a digest
+    for delivery in deliveries:
+        completed_buffer.add(delivery)
+
+
+@asynccontextmanager
+async def producer_interactors(
+    pool: async_sessionmaker[AsyncSession],
+) -> AsyncIterator[ProducerInteractors]:
+    # Reminders are streamed by a server-side cursor of the first session, so deliveries are added by another one
+    async with pool() as session, pool() as outbox_session:
+        uow = SQLAlchemyUoW(session)
+
+        yield ProducerInteractors(
+            GetTimezones(UserReaderImpl(session), uow),
+            StreamBySlot(BirthdayRemindReaderImpl(session), uow),
+            AddDeliveries(
+                DeliveryRepoImpl(outbox_session),
+                SQLAlchemyUoW(outbox_session),
+            ),
+            GetSchedulerCheckpointByName(
+                SchedulerCheckpointReaderImpl(session), uow
+            ),
+            SaveSchedulerCheckpoint(SchedulerCheckpointRepoImpl(session), uow),
+        )
 
-            break
 
+async def claim_deliveries(
+    pool: async_sessionmaker[AsyncSession],
+    request: ClaimDeliveriesRequest,
+) -> list[DeliveryWithRemind]:
+    async with pool() as session:
+        command = ClaimDeliveries(
+            DeliveryRepoImpl(session), SQLAlchemyUoW(session)
+        )
 
-async def consumer(
-    queue: Queue[BirthdayRemind],
-    get_by_id: GetByID,
-    get_completed_birthday_remind: GetByBirthdayRemindIDAndYear,
-    add_completed_birthday_remind: AddCompletedBirthdayRemind,
-    bot: Bot,
-    l10ns: dict[str, FluentLocalization],
-    default_lang: str,
+        return await command(request)
+
+
+async def claim_completions(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+    deliveries: list[Delivery],
+) -> list[Delivery]:
+    async with pool() as session:
+        command = ClaimCompletions(
+            DeliveryRepoImpl(session),
+            storage.repo(session),
+            SQLAlchemyUoW(session),
+        )
+
+        return await command(deliveries)
+
+
+async def complete_deliveries(
+    pool: async_sessionmaker[AsyncSession],
+    deliveries: list[Delivery],
 ) -> None:
-    logger.debug("Starting the consumer")
+    async with pool() as session:
+        command = CompleteDeliveries(
+            DeliveryRepoImpl(session), SQLAlchemyUoW(session)
+        )
 
-    while True:
-        remind = await queue.get()
+        await command(deliveries)
 
-        logger.info(f"Consumed: {remind}")
 
-        try:
-            user = await get_by_id(remind.user_id)
-        except IDNotFound as err:
-            logger.warn(err)
+async def release_deliveries(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+    deliveries: list[Delivery],
+) -> None:
+    async with pool() as session:
+        command = ReleaseDeliveries(
+            DeliveryRepoImpl(session),
+            storage.repo(session),
+            SQLAlchemyUoW(session),
+        )
 
-            continue
+        await command(deliveries)
+
+
+async def release_unsent(
+    release: Callable[[list[Delivery]], Awaitable[None]],
+    deliveries: list[Delivery],
+) -> None:
+    if not deliveries:
+        return
+
+    try:
+        await release(deliveries)
+    except Exception as err:
+        logger.error(
+            "Error while releasing unsent deliveries. They will be claimed again when their lease expires",
+            exc_info=err,
+        )
+
+        return
+
+    logger.info(
+        "Unsent deliveries released",
+        extra={"deliveries_count": len(deliveries)},
+    )
+
+
+async def release_payloads(
+    release: Callable[[list[Delivery]], Awaitable[None]],
+    payloads: list[Payload],
+) -> None:
+    await release_unsent(
+        release,
+        [delivery for payload in payloads for delivery in payload.deliveries],
+    )
+
+
+def drain(queue: Queue[Payload]) -> list[Payload]:
+    payloads = []
+    while not queue.empty():
+        payloads.append(queue.get_nowait())
+        queue.task_done()
+
+    return payloads
+
+
+async def retry_deliveries(
+    pool: async_sessionmaker[AsyncSession],
+    storage: CompletedBirthdayRemindStorage,
+    policy: RetryPolicy,
+    failures: list[DeliveryFailure],
+) -> None:
+    async with pool() as session:
+        command = RetryDeliveries(
+            DeliveryRepoImpl(session),
+            storage.repo(session),
+            SQLAlchemyUoW(session),
+        )
+
+        await command(RetryDeliveriesRequest(failures, policy))
+
+
+async def claimer(
+    queue: Queue[Payload],
+    claim: Callable[[], Awaitable[list[DeliveryWithRemind]]],
+    renderer: Renderer,
+    poll_interval: float,
+    digest: bool,
+    release: Callable[[list[Delivery]], Awaitable[None]],
+) -> None:
+    """
+    This function claims batches of deliveries from the outbox, renders them grouped by the user
+    and puts ready-to-send payloads in the queue of the consumer, so senders don't format messages.
+    The queue should be bounded, so deliveries are claimed only when the consumer is ready for them
+    and leases don't expire while deliveries wait in the queue.
+
+    :param queue: The queue of the consumer.
+    :param claim: The function to be used to claim the next batch of deliveries.
+    :param renderer: The renderer of the messages.
+    :param poll_interval: The interval in seconds between claims when the outbox is empty.
+    :param digest: Whether to render reminders of a user as one message.
+    :param release: The function to be used to release deliveries that can't be rendered or aren't put in the queue when the claimer is stopped.
+
+    :return: None
+    """
+
+    logger.debug("Starting the claimer")
+
+    while True:
+        try:
+            deliveries = await claim()
         except RepoError as err:
-            logger.error("Error while getting user by ID", exc_info=err)
+            logger.error("Error while claiming deliveries", exc_info=err)
 
             await asyncio.sleep(5)
 
             continue
         except Exception as err:
             logger.critical(
-                "Unknown error while getting user by ID", exc_info=err
+                "Unknown error while claiming deliveries", exc_info=err
             )
 
             await asyncio.sleep(5)
 
             continue
 
-        today = date.today()
-
-        today_day = today.day
-        today_month = today.month
+        if not deliveries:
+            await asyncio.sleep(poll_interval)
 
-        lang = user.language_code
-
-        if not lang:
-            lang = default_lang
-        elif lang not in l10ns:
-            lang = default_lang
+            continue
 
-            logger.debug(
-                "Language not found, using default", extra={"lang": lang}
-            )
+        logger.debug(
+            "Deliveries claimed", extra={"deliveries_count": len(deliveries)}
+        )
 
-        l10n = l10ns[lang]
+        groups: dict[UUID, list[DeliveryWithRemind]] = {}
+        for delivery in deliveries:
+            groups.setdefault(delivery.user.id, []).append(delivery)
 
-        type: ReminderType
-        if today_day == remind.day and today_month == remind.month:
-            type = ReminderType.OnTheDay
-        else:
-            type = ReminderType.BeforehandInOneDay
+        started_at = time.perf_counter()
 
         try:
-            completed_birthday_remind = await get_completed_birthday_remind(
-                remind.id,
-                today.year,
-                type,
+            payloads = renderer.render(list(groups.values()), digest)
+        except Exception as err:
+            logger.critical(
+                "Unknown error while rendering deliveries", exc_info=err
             )
 
-            logger.debug(
-                f"Completed birthday remind found: {completed_birthday_remind}. Skipping."
+            # The outbox leases and the completion records of the batch are dropped, so it's sent later
+            await release_unsent(
+                release, [delivery.delivery for delivery in deliveries]
             )
+            await asyncio.sleep(5)
 
             continue
-        except IDForYearAndTypeNotFound as err:
-            logger.debug(err)
 
-        if type is ReminderType.OnTheDay:
-            logger.debug(
-                "Today is birthday",
-                extra={"birthday_remind": remind},
-            )
+        logger.debug(
+            "Deliveries rendered",
+            extra={
+                "payloads_count": len(payloads),
+                "seconds": time.perf_counter() - started_at,
+            },
+        )
 
-            text = l10n.format_value("birthday-today", {"name": remind.name})
-        else:
-            logger.debug(
-                "Birthday is coming soon",
-                extra={"birthday_remind": remind},
-            )
+        for number, payload in enumerate(payloads):
+            try:
+                await queue.put(payload)
+            except asyncio.CancelledError:
+                await release_payloads(release, payloads[number:])
 
-            text = l10n.format_value(
-                "birthday-coming-soon",
-                {"name": remind.name},
-            )
+                raise
+
+
+def get_shard(payload: Payload, shards_count: int) -> int:
+    # All messages to a chat go to the same worker, so they stay in order
+    return payload.chat_id % shards_count
 
-        await send_message_with_retries(
-            bot,
-            user.tg_id,
-            text,
-            parse_mode=None,
-        )
 
-        await add_completed_birthday_remind(
-            CompletedBirthdayRemind(uuid7(), remind.id, today.year, type)
+async def worker(
+    number: int,
+    queue: Queue[Payload],
+    claim_completions: Callable[[list[Delivery]], Awaitable[list[Delivery]]],
+    renderer: Renderer,
+    completed_buffer: WriteBuffer[Delivery],
+    failed_buffer: WriteBuffer[DeliveryFailure],
+    bot: Bot,
+    rate_limiter: RateLimiter,
+    in_flight: dict[int, Payload],
+    stopping: asyncio.Event,
+) -> None:
+    logger.debug("Starting the consumer worker", extra={"number": number})
+
+    # Reminders are sent after interactive replies of handlers
+    with bulk_priority():
+        while not stopping.is_set():
+            payload = await queue.get()
+
+            in_flight[number] = payload
+
+            try:
+                await handle_payload(
+                    payload,
+                    claim_completions,
+                    renderer,
+                    completed_buffer,
+                    failed_buffer,
+                    bot,
+                    rate_limiter,
+                )
+            except Exception as err:
+                logger.critical(
+                    "Unknown error while handling birthday remind",
+                    exc_info=err,
+                )
+
+            # If the worker is cancelled while sending, the payload stays in flight and is released as unsent
+            del in_flight[number]
+            queue.task_done()
+
+
+async def consumer(
+    queue: Queue[Payload],
+    claim_completions: Callable[[list[Delivery]], Awaitable[list[Delivery]]],
+    renderer: Renderer,
+    completed_buffer: WriteBuffer[Delivery],
+    failed_buffer: WriteBuffer[DeliveryFailure],
+    bot: Bot,
+    rate_limiter: RateLimiter,
+    workers_count: int,
+    release: Callable[[list[Delivery]], Awaitable[None]],
+    shutdown_timeout: float,
+) -> None:
+    """
+    This function is a consumer that distributes rendered birthday reminders from the queue between a pool of workers.
+    Messages are sharded by the chat, and all workers share one send budget.
+    Queues of workers have the same size as the main queue, so a slow worker slows down the claimer.
+
+    When the consumer is cancelled, it stops taking payloads and lets workers finish in-flight sends
+    within `shutdown_timeout` seconds. Leases of the payloads that weren't sent are released,
+    so they're claimed again at once instead of when their lease expires.
+
+    :param queue: The queue where the claimer puts rendered payloads.
+    :param claim_completions: The function to be used to record reminders of a payload as completed right before it's sent.
+    :param renderer: The renderer of payloads whose reminders are completed only in part.
+    :param completed_buffer: The buffer where sent deliveries are marked as done.
+    :param failed_buffer: The buffer where failed deliveries are scheduled to be retried.
+    :param rate_limiter: The send budget shared by all workers.
+    :param workers_count: The number of workers.
+    :param release: The function to be used to release unsent deliveries.
+    :param shutdown_timeout: The time in seconds to finish in-flight sends when the consumer is cancelled.
+
+    :return: None
+    """
+
+    logger.debug(
+        "Starting the consumer", extra={"workers_count": workers_count}
+    )
+
+    shards: list[Queue[Payload]] = [
+        Queue(maxsize=queue.maxsize) for _ in range(workers_count)
+    ]
+    in_flight: dict[int, Payload] = {}
+    stopping = asyncio.Event()
+    workers = [
+        asyncio.create_task(
+            worker(
+                number,
+                shard,
+                claim_completions,
+                renderer,
+                completed_buffer,
+                failed_buffer,
+                bot,
+                rate_limiter,
+                in_flight,
+                stopping,
+            )
         )
+        for number, shard in enumerate(shards)
+    ]
+
+    # The payload taken from the main queue, but not put in the queue of a worker yet
+    dispatched: Payload | None = None
+    try:
+        while True:
+            dispatched = await queue.get()
+
+            await shards[get_shard(dispatched, workers_count)].put(dispatched)
+
+            dispatched = None
+            queue.task_done()
+    finally:
+        stopping.set()
+
+        # Idle workers wait for payloads, so they're stopped at once
+        for number, task in enumerate(workers):
+            if number not in in_flight:
+                task.cancel()
+
+        busy = [workers[number] for number in in_flight]
+        if busy:
+            logger.info(
+                "Waiting for in-flight sends",
+                extra={"workers_count": len(busy)},
+            )
 
-        queue.task_done()
+            _, pending = await asyncio.wait(busy, timeout=shutdown_timeout)
+            for task in pending:
+                task.cancel()
+
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        unsent = [*in_flight.values(), *drain(queue)]
+        if dispatched is not None:
+            unsent.append(dispatched)
+        for shard in shards:
+            unsent.extend(drain(shard))
 
-        await asyncio.sleep(0.03)
+        await release_payloads(release, unsent)
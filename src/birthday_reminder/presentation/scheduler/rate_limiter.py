@@ -0,0 +1,28 @@
+import asyncio
+from logging import getLogger
+
+logger = getLogger(__name__)
+
+
+class RateLimiter:
+    """
+    A send budget shared by all consumer workers.
+    Global limits of Telegram are enforced by the rate governor of the bot session, this budget only limits reminders.
+    Every call of `acquire` reserves the next free slot, so the total rate of all workers doesn't exceed `rate` per second.
+    """
+
+    def __init__(self, rate: float) -> None:
+        self._interval = 1 / rate
+        self._next_at = 0.0
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+
+        now = loop.time()
+        at = max(now, self._next_at)
+
+        # Reserve the slot before sleeping, so concurrent callers get the next ones
+        self._next_at = at + self._interval
+
+        if at > now:
+            await asyncio.sleep(at - now)
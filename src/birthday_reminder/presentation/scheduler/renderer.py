@@ -0,0 +1,244 @@
+from dataclasses import dataclass
+from logging import getLogger
+from typing import Any
+
+from fluent.runtime import FluentBundle, FluentResourceLoader
+from fluent.runtime.types import FluentType
+
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    ReminderType,
+)
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryWithRemind,
+)
+
+logger = getLogger(__name__)
+
+RESOURCE_IDS = ["main.ftl"]
+
+
+def load_bundles(
+    loader: FluentResourceLoader, locales: list[str]
+) -> list[FluentBundle]:
+    """
+    Load bundles of the locales in the fallback order, like `FluentLocalization` does.
+    """
+
+    bundles = []
+    for locale in locales:
+        for resources in loader.resources(locale, RESOURCE_IDS):
+            bundle = FluentBundle([locale])
+            for resource in resources:
+                bundle.add_resource(resource)
+
+            bundles.append(bundle)
+
+    return bundles
+
+
+@dataclass
+class Payload:
+    """
+    A ready-to-send message. Its deliveries are marked as done after it's sent.
+    """
+
+    chat_id: int
+    text: str
+    lang: str
+    jobs: list[DeliveryWithRemind]
+
+    @property
+    def deliveries(self) -> list[Delivery]:
+        return [job.delivery for job in self.jobs]
+
+
+class Renderer:
+    """
+    Renders reminders to ready-to-send payloads.
+    Bundles of every locale and its fallback are loaded once, and a compiled pattern of a message is cached
+    per (locale, message id), so rendering doesn't walk the fallback chain for every reminder.
+    """
+
+    def __init__(
+        self,
+        loader: FluentResourceLoader,
+        langs: list[str],
+        default_lang: str,
+    ) -> None:
+        self._default_lang = default_lang
+        self._bundles = {
+            lang: load_bundles(
+                loader, list(dict.fromkeys([lang, default_lang]))
+            )
+            for lang in langs
+        }
+        self._patterns: dict[tuple[str, str], tuple[FluentBundle, Any]] = {}
+
+    def get_lang(self, language_code: str | None) -> str:
+        if not language_code:
+            return self._default_lang
+
+        if language_code not in self._bundles:
+            logger.debug(
+                "Language not found, using default",
+                extra={"lang": language_code},
+            )
+
+            return self._default_lang
+
+        return language_code
+
+    def _get_pattern(
+        self, lang: str, message_id: str
+    ) -> tuple[FluentBundle, Any] | None:
+        key = (lang, message_id)
+
+        try:
+            return self._patterns[key]
+        except KeyError:
+            pass
+
+        # The same lookup as `FluentLocalization.format_value` does for every call
+        for bundle in self._bundles[lang]:
+            if not bundle.has_message(message_id):
+                continue
+
+            message = bundle.get_message(message_id)
+            if not message.value:
+                continue
+
+            self._patterns[key] = (bundle, message.value)
+
+            return self._patterns[key]
+
+        return None
+
+    def format(
+        self,
+        lang: str,
+        message_id: str,
+        args: dict[str, str | int | float | FluentType] | None = None,
+    ) -> str:
+        pattern = self._get_pattern(lang, message_id)
+        if pattern is None:
+            # The same fallback as `FluentLocalization.format_value` has, so a missing message doesn't fail the batch
+            logger.error(
+                "Message not found",
+                extra={"message_id": message_id, "lang": lang},
+            )
+
+            return message_id
+
+        bundle, value = pattern
+
+        text, errors = bundle.format_pattern(value, args)
+        if errors:
+            logger.error(
+                "Errors while formatting the message",
+                extra={"message_id": message_id, "errors": errors},
+            )
+
+        return str(text)
+
+    def render_remind(self, lang: str, job: DeliveryWithRemind) -> str:
+        if job.delivery.reminder_type is ReminderType.OnTheDay:
+            return self.format(
+                lang, "birthday-today", {"name": job.remind.name}
+            )
+
+        return self.format(
+            lang, "birthday-coming-soon", {"name": job.remind.name}
+        )
+
+    def render_digest(self, lang: str, jobs: list[DeliveryWithRemind]) -> str:
+        today_names = [
+            job.remind.name
+            for job in jobs
+            if job.delivery.reminder_type is ReminderType.OnTheDay
+        ]
+        tomorrow_names = [
+            job.remind.name
+            for job in jobs
+            if job.delivery.reminder_type is ReminderType.BeforehandInOneDay
+        ]
+
+        parts = []
+        if today_names:
+            parts.append(
+                self.format(
+                    lang,
+                    "birthday-digest-today",
+                    {"names": ", ".join(today_names)},
+                )
+            )
+        if tomorrow_names:
+            parts.append(
+                self.format(
+                    lang,
+                    "birthday-digest-tomorrow",
+                    {"names": ", ".join(tomorrow_names)},
+                )
+            )
+
+        return "\n\n".join(parts)
+
+    def render(
+        self, groups: list[list[DeliveryWithRemind]], digest: bool
+    ) -> list[Payload]:
+        """
+        Render reminders grouped by the user.
+        Groups are rendered by the locale, so patterns of one locale are reused while they're hot.
+        In the digest mode, all reminders of a user are rendered as one payload.
+        """
+
+        groups_by_lang: dict[str, list[list[DeliveryWithRemind]]] = {}
+        for group in groups:
+            groups_by_lang.setdefault(
+                self.get_lang(group[0].user.language_code), []
+            ).append(group)
+
+        payloads = []
+        for lang, lang_groups in groups_by_lang.items():
+            for group in lang_groups:
+                chat_id = group[0].user.tg_id
+
+                if digest and len(group) > 1:
+                    payloads.append(
+                        Payload(
+                            chat_id,
+                            self.render_digest(lang, group),
+                            lang,
+                            group,
+                        )
+                    )
+
+                    continue
+
+                payloads.extend(
+                    Payload(
+                        chat_id,
+                        self.render_remind(lang, job),
+                        lang,
+                        [job],
+                    )
+                    for job in group
+                )
+
+        return payloads
+
+    def narrow(self, payload: Payload, deliveries: list[Delivery]) -> Payload:
+        """
+        Render the payload again only for `deliveries` of it,
+        so a digest doesn't repeat reminders that are already sent.
+        """
+
+        ids = {delivery.id for delivery in deliveries}
+        jobs = [job for job in payload.jobs if job.delivery.id in ids]
+
+        if len(jobs) == 1:
+            text = self.render_remind(payload.lang, jobs[0])
+        else:
+            text = self.render_digest(payload.lang, jobs)
+
+        return Payload(payload.chat_id, text, payload.lang, jobs)
@@ -0,0 +1,49 @@
+from datetime import date, datetime, timezone
+
+from birthday_reminder.application.scheduler.nearest_birthday_reminders import (
+    get_slots,
+)
+from birthday_reminder.config import Reminder as ReminderConfig
+
+
+def get_config(hour: int) -> ReminderConfig:
+    return ReminderConfig(hour=hour, tz_raw="Europe/Berlin")
+
+
+def test_hour_skipped_by_spring_forward_is_in_the_next_slot():
+    # Clocks in Europe/Berlin go forward from 02:00 to 03:00 on 2024-03-31
+    at = datetime(2024, 3, 31, 1, tzinfo=timezone.utc)
+
+    (slot,) = get_slots(at, ["Europe/Berlin"], get_config(2), at)
+
+    assert slot.hours == [2, 3]
+    assert slot.today == date(2024, 3, 31)
+    assert slot.include_unset_timezone
+    assert slot.include_unset_hour
+
+
+def test_hour_before_spring_forward_is_not_repeated():
+    at = datetime(2024, 3, 31, 0, tzinfo=timezone.utc)
+
+    (slot,) = get_slots(at, ["Europe/Berlin"], get_config(2), at)
+
+    assert slot.hours == [1]
+    assert not slot.include_unset_hour
+
+
+def test_repeated_hour_of_fall_back_has_one_hour():
+    # Clocks in Europe/Berlin go back from 03:00 to 02:00 on 2024-10-27
+    for hour in (0, 1):
+        at = datetime(2024, 10, 27, hour, tzinfo=timezone.utc)
+
+        (slot,) = get_slots(at, ["Europe/Berlin"], get_config(2), at)
+
+        assert slot.hours == [2]
+
+
+def test_timezones_with_different_hours_are_in_different_slots():
+    at = datetime(2024, 3, 31, 1, tzinfo=timezone.utc)
+
+    slots = get_slots(at, ["Europe/Berlin", "Africa/Lagos"], get_config(2), at)
+
+    assert sorted(slot.hours for slot in slots) == [[2], [2, 3]]
@@ -0,0 +1,111 @@
+import asyncio
+from pathlib import Path
+from uuid import uuid4
+
+from fluent.runtime import FluentResourceLoader
+
+import birthday_reminder
+from birthday_reminder.domain.birthday_remind.entities import BirthdayRemind
+from birthday_reminder.domain.completed_birthday_remind.entities import (
+    ReminderType,
+)
+from birthday_reminder.domain.delivery.entities import (
+    Delivery,
+    DeliveryWithRemind,
+)
+from birthday_reminder.domain.user.entities import User
+from birthday_reminder.presentation.scheduler import RateLimiter, Renderer
+from birthday_reminder.presentation.scheduler.nearest_birthday_reminders import (
+    handle_payload,
+)
+
+
+class Buffer:
+    def __init__(self) -> None:
+        self.items = []
+
+    def add(self, item) -> None:
+        self.items.append(item)
+
+
+class Bot:
+    def __init__(self) -> None:
+        self.texts = []
+
+    async def send_message(self, chat_id, text, **kwargs) -> None:
+        self.texts.append(text)
+
+
+def get_renderer() -> Renderer:
+    path = Path(birthday_reminder.__file__).parent / "locales" / "{locale}"
+
+    return Renderer(FluentResourceLoader(str(path)), ["en"], "en")
+
+
+def get_job(user: User, name: str) -> DeliveryWithRemind:
+    remind = BirthdayRemind(uuid4(), user.id, name, 1, 1)
+
+    return DeliveryWithRemind(
+        Delivery(uuid4(), remind.id, 2026, ReminderType.OnTheDay),
+        remind,
+        user,
+    )
+
+
+def test_partially_claimed_digest_is_rendered_again():
+    renderer = get_renderer()
+    user = User(uuid4(), "en", 1)
+    sent_job = get_job(user, "Alice")
+    unsent_job = get_job(user, "Bob")
+    (payload,) = renderer.render([[sent_job, unsent_job]], digest=True)
+
+    async def claim_completions(deliveries):
+        # The reminder of Alice is already completed by an earlier send
+        return [unsent_job.delivery]
+
+    completed_buffer = Buffer()
+    bot = Bot()
+
+    asyncio.run(
+        handle_payload(
+            payload,
+            claim_completions,
+            renderer,
+            completed_buffer,
+            Buffer(),
+            bot,
+            RateLimiter(1000),
+        )
+    )
+
+    assert len(bot.texts) == 1
+    assert "Bob" in bot.texts[0]
+    assert "Alice" not in bot.texts[0]
+    assert completed_buffer.items == [unsent_job.delivery]
+
+
+def test_completed_payload_is_skipped():
+    renderer = get_renderer()
+    user = User(uuid4(), "en", 1)
+    (payload,) = renderer.render([[get_job(user, "Alice")]], digest=True)
+
+    async def claim_completions(deliveries):
+        return []
+
+    completed_buffer = Buffer()
+    bot = Bot()
+
+    asyncio.run(
+        handle_payload(
+            payload,
+            claim_completions,
+            renderer,
+            completed_buffer,
+            Buffer(),
+            bot,
+            RateLimiter(1000),
+        )
+    )
+
+    assert bot.texts == []
+    assert completed_buffer.items == []
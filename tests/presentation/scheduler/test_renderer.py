@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from fluent.runtime import FluentResourceLoader
+
+import birthday_reminder
+from birthday_reminder.presentation.scheduler import Renderer
+
+
+def get_renderer() -> Renderer:
+    path = Path(birthday_reminder.__file__).parent / "locales" / "{locale}"
+
+    return Renderer(FluentResourceLoader(str(path)), ["en", "ru"], "en")
+
+
+def test_missing_message_falls_back_to_its_id():
+    assert get_renderer().format("en", "no-such-message") == "no-such-message"
+
+
+def test_message_is_formatted_in_the_language():
+    renderer = get_renderer()
+
+    assert "Alice" in renderer.format(
+        "ru", "birthday-today", {"name": "Alice"}
+    )
+    assert renderer.format(
+        "ru", "birthday-today", {"name": "Alice"}
+    ) != renderer.format("en", "birthday-today", {"name": "Alice"})